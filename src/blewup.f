@@ -0,0 +1,19 @@
+      logical function blewup()
+c       true if the column has gone bad: a value that is not finite, or
+c       a density, pressure or temperature that is not positive (the
+c       test AXIsolver.blewUp makes). NaN is caught with .ne. first,
+c       so no ordered compare meets one under -ffpe-trap=invalid.
+        use rrstate
+        blewup = .true.
+        do 10 i = 1,neta
+          if (r(i).ne.r(i) .or. u(i).ne.u(i) .or. v(i).ne.v(i) .or.
+     1        p(i).ne.p(i)) return
+          if (abs(r(i)).gt.huge(r(i)) .or. abs(u(i)).gt.huge(u(i)) .or.
+     1        abs(v(i)).gt.huge(v(i)) .or. abs(p(i)).gt.huge(p(i)))
+     2      return
+          t = hinf-.5*(u(i)**2 + v(i)**2)
+          if (r(i).le.0. .or. p(i).le.0. .or. t.le.0.) return
+10      continue
+        blewup = .false.
+        return
+      end
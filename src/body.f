@@ -1,6 +1,5 @@
        subroutine body
-         logical march, betlok
-         include 'common.inc'
+         use rrstate
        if (march) then
          x(1) = x(2)
          x(2) = x(1) + dxi
@@ -36,10 +35,11 @@
          rbx(i) = 0.
        end if
 200    continue
-       if (march) then
+c      grow the marching step, holding beta*dxi fixed, up to dximax
+       if (march .and. 1.005*dxi .le. dximax) then
          dxi = 1.005 * dxi
          beta = beta/1.005
        end if
-       print *,'rb = ', rb(1), ' rs = ', rs(1)
+       if (itrace .ge. 1) call trace(1,12,0,2,(/rb(1),rs(1)/))
        return
        end
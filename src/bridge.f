@@ -0,0 +1,46 @@
+      subroutine rrstep(n,ar,au,av,ap,aeta,apred,geom,dx,xmu,bet,hin,
+     1  pin,den,lock,dmax) bind(C,name='rrstep')
+c       one precor station update for a caller that owns the flow
+c       field (test/FortranKernel.py). The state arrays are pointed at
+c       the caller's points 1 - n and updated in place; apred gets the
+c       predicted pressures at points 2 - n-1.
+c       geom holds rb, rbx, rs, rsx at level 1, then at level 2;
+c       den is the inverse eta spacing and lock the betlok flag.
+        use iso_c_binding
+        use rrstate
+        integer(c_int), value :: n
+        type(c_ptr), value :: ar,au,av,ap,aeta,apred
+        real(c_double) geom(8)
+        real(c_double), value :: dx,xmu,bet,hin,pin,den
+        integer(c_int) lock
+        real(c_double) dmax
+        call c_f_pointer(ar,r,(/n/))
+        call c_f_pointer(au,u,(/n/))
+        call c_f_pointer(av,v,(/n/))
+        call c_f_pointer(ap,p,(/n/))
+        call c_f_pointer(aeta,eta,(/n/))
+        call c_f_pointer(apred,ppred,(/n/))
+        neta = n
+        nem1 = n-1
+        do 10 j = 1,2
+          rb(j) = geom(4*j-3)
+          rbx(j) = geom(4*j-2)
+          rs(j) = geom(4*j-1)
+          rsx(j) = geom(4*j)
+10      continue
+        dxi = dx
+        xmu1 = xmu
+        beta = bet
+        hinf = hin
+        pinf = pin
+        deta = 1./den
+        betlok = lock .ne. 0
+        itrace = 0
+        delm = 0.
+        call precor
+        lock = 0
+        if (betlok) lock = 1
+        dmax = delm
+        nullify(r,u,v,p,eta,ppred)
+        return
+      end
@@ -1,5 +1,5 @@
       subroutine precor
-        include "common.inc"
+        use rrstate
         dimension w(4,3)
 c       zero out the w array
         do 20 i = 1,4
@@ -7,7 +7,6 @@ c       zero out the w array
             w(i,j) = 0.0
 15        continue
 20      continue
-        print *,"precor=", mit
         do 10 i=2,neta
           if (i.eq.neta) then
 c           outer boundary point
@@ -40,16 +39,20 @@ c             wall boundary point --------------
               sigxrm=xmu1*(etaxm*vetam+etar*uetam)
               trrm = 2.0*xmu1*etar*vetam - 
      1           2.0/3.0*xmu1*beta*deldvm
-              print *, etaxm,den1,uetam,vetam
-              print *, deldvm,txxm,sigxrm,trrm
+              if (itrace .ge. 3) then
+                call trace(3,1,i,4,(/etaxm,den1,uetam,vetam/))
+                call trace(3,2,i,4,(/deldvm,txxm,sigxrm,trrm/))
+              end if
               e1p = r(i)*u(i)*r1
               e2p = e1p*u(i)+p(i)*r1-txxm*r1
               e3p = e1p*v(i)-sigxrm*r1
               f1p = r(i)*v(i)*r1
               f2p = f1p*u(i)-sigxrm*r1
               f3p = f1p*v(i)+p(i)*r1-trrm*r1
-              print *,e1p,e2p,e3p
-              print *,f1p,f2p,f3p
+              if (itrace .ge. 3) then
+                call trace(3,3,i,3,(/e1p,e2p,e3p/))
+                call trace(3,4,i,3,(/f1p,f2p,f3p/))
+              end if
             end if
             if (i.gt.2) etaxm = etaxpp
 c             normal field point ------------------------
@@ -83,10 +86,12 @@ c             normal field point ------------------------
             h3 = -sigpp
             h2 = 0.0
             h1 = 0.0
-            print *, 'E:',ep1,ep2,ep3
-            print *, 'e1x:',e1m,e1p
-            print *, 'e2x:',e2m,e2p
-            print *, 'e3x:',e3m,e3p
+            if (itrace .ge. 3) then
+              call trace(3,13,i,3,(/ep1,ep2,ep3/))
+              call trace(3,6,i,2,(/e1m,e1p/))
+              call trace(3,7,i,2,(/e2m,e2p/))
+              call trace(3,8,i,2,(/e3m,e3p/))
+            end if
             ep1 = ep1 -dxi*etaxm*den1*(e1p-e1m) -
      2          dxi*etar*den1*(f1p-f1m)+dxi*h1
             ep2 = ep2 -dxi*etaxm*den1*(e2p-e2m) - 
@@ -94,19 +99,19 @@ c             normal field point ------------------------
             ep3 = ep3 -dxi*etaxm*den1*(e3p-e3m) - 
      4          dxi*etar*den1*(f3p-f3m)+dxi*h3
             r2 = rb(2)+eta(i)*(rs(2)-rb(2))
-            print *, ep1,ep2,ep3
+            if (itrace .ge. 2) call trace(2,5,i,3,(/ep1,ep2,ep3/))
             aa = ep1/r2
             bb = ep2/r2
             cc = ep3/r2
 
-            call solve
-            print *, "debug"
+            call solve(i)
+            if (associated(ppred)) ppred(i) = pp
             do 70 j = 1,4
               w(j,1) = w(j,2)
               w(j,2) = w(j,3)
 70          continue
             w(1,3) = rr
-            w(3,3) = uu
+            w(2,3) = uu
             w(3,3) = vv
             w(4,3) = pp
           end if
@@ -178,7 +183,7 @@ C           corrector step starts here
             aa = ep1/r2
             bb = ep2/r2
             cc = ep3/r2
-            call solve
+            call solve(i-1)
             r(i-1)    = rr
             u(i-1)    = uu
             v(i-1)    = vv
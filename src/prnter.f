@@ -1,12 +1,11 @@
       subroutine prnter
-        logical march, betlok
-        include 'common.inc'
+        use rrstate
         character ptg*11
 
-        call clear
+        if (iclear .ne. 0) call clear
         write(*,'(1x,"Flow-Field Profiles")')
         if (march) then
-          write(*,'(1x,"Axial location=",f10.5)')
+          write(*,'(1x,"Axial location=",f10.5)') x(2)
         else
           write(*,'(1x,"Tangent cone iteration=",i3)') mit
         end if
@@ -16,7 +15,11 @@
         write(*,'(1x,"rbx=",f10.6,"rsx=",f10.6,/)') rbx(2),rsx(2)
         write(*,'(2x,"|",5x,"Rho",8x,"U",9x,"V",9x,
      1    "P",8x,"Pt",8x,"Pt")')
-        do 20 i = neta,1,-3
+c       every third point, thinned further on big grids, and always
+c       ending on the wall
+        istep = 3*max(1,neta/51)
+        do 20 k = neta,2-istep,-istep
+          i = max(k,1)
           t = hinf-.5*(u(i)**2 + v(i)**2)
           pt2 = p(i)
           ptg = '|----------'
@@ -26,10 +29,21 @@
             pt2 = p(i)/pinf*(xm/xminf)**7*
      1          ((7.*xminf**2-1.)/(7.*xm**2-1.))**2.5
           end if
-          j = (pt2/3.0)*10+1
+          j = (min(max(pt2,0.),3.)/3.0)*10+1
           ptg(j:j) = '*'
-          write(*,'(1x,i2,7f10.6,2x,a11)')
-     1       i,r(i),u(i),v(i),p(i),pt2,t,xm,ptg
+          if (neta .lt. 100) then
+            write(*,'(1x,i2,7f10.6,2x,a11)')
+     1         i,r(i),u(i),v(i),p(i),pt2,t,xm,ptg
+          else
+            write(*,'(1x,i6,7f10.6,2x,a11)')
+     1         i,r(i),u(i),v(i),p(i),pt2,t,xm,ptg
+          end if
 20    continue
       return
       end
+
+      subroutine clear
+c       clear the terminal with ANSI codes instead of running clear(1)
+        write(*,'(a)',advance='no') char(27)//'[H'//char(27)//'[2J'
+        return
+      end
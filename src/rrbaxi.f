@@ -1,7 +1,11 @@
        program rrbaxi
-       logical march,convrg,defdat,betlok
+       use rrstate
+       logical convrg,defdat,blewup
        character flag
-       include "common.inc"
+       character*256 fname
+       namelist /input/ tref,xmuref,reref,xminf,thetas,x0,xl1,xlc,xh,
+     1   dxi,dximax,xmuinf,beta,neta,nitmax,nplot,dplot,xplot,irelse,
+     2   iclear,itrace,itrlo,itrhi,itslo,itshi,ntrace
 
 C      set logical flags
        march = .false.
@@ -16,6 +20,11 @@ C      set logical flags
        thetas = 22.0
        x0 = 5.0
        dxi = 0.0004
+c      the marching step grows by 1.005 a step with no limit; finer
+c      grids need a smaller dxi and a cap on the growth, since the
+c      viscous limit goes with deta**2 (neta 101 runs at dxi 1.e-4 with
+c      dximax 1.2e-4, neta 201 at 2.5e-5, neta 501 at 3.e-6)
+       dximax = 1.e30
        xmuinf = 0.00002
        beta = -20.0
        neta = 31
@@ -23,6 +32,52 @@ C      set logical flags
        nplot = 2
        dplot = 0.1
        xplot = 0.1
+       xl1 = 22.5
+       xlc = 27.5
+       xh = 4.25
+
+c      debug trace: level, point range, station range, binary unit
+c      (ntrace = 0 prints the trace, otherwise it goes to rrbaxi.trc)
+       itrace = 0
+       itrlo = 1
+       itrhi = 9999
+       itslo = 0
+       itshi = 999999
+       ntrace = 0
+
+c      batch mode: with an input file named on the command line the
+c      run does not stop to ask before marching or clear the screen for
+c      each report (iclear = 0). irelse = 1 marches once the tangent
+c      cone converges, irelse = 2 also after nitmax sweeps, and 0 asks.
+c      The &input namelist in the file can set these and any of the
+c      values above.
+       irelse = 0
+       iclear = 1
+       if (command_argument_count() .ge. 1) then
+         call get_command_argument(1, fname)
+         irelse = 1
+         iclear = 0
+         open(9, file=fname, status='old', iostat=ios)
+         if (ios .ne. 0) then
+           write(*,'(1x,"rrbaxi: cannot open ",a)') trim(fname)
+           stop 1
+         end if
+         read(9, nml=input, iostat=ios)
+         close(9)
+         if (ios .ne. 0) then
+           write(*,'(1x,"rrbaxi: bad &input namelist in ",a)')
+     1       trim(fname)
+           stop 1
+         end if
+       end if
+       if (neta .lt. 3) then
+         write(*,'(1x,"rrbaxi: neta must be at least 3")')
+         stop 1
+       end if
+       call alloc(neta)
+
+       if (ntrace .gt. 0) open(ntrace, file='rrbaxi.trc',
+     1    access='stream', form='unformatted', status='replace')
 
        hinf = (1.+2./(.4*xminf**2))/2.
        pinf = 1./(1.4*xminf**2)
@@ -31,9 +86,7 @@ C      set logical flags
        deta = 1./an
        pi = acos(-1.)
        drcon = pi/180.
-       xl1 = 22.5
-       xl2 = xl1+27.5
-       xh = 4.25
+       xl2 = xl1+xlc
        rn = xh/2.+xl1*xl1/(2*xh)
        thetab = asin((xl1-x0)/rn)
        thetas = thetas*drcon
@@ -65,8 +118,13 @@ c      set initial conditions
        delm = 0.
        call body
        call precor
+       if (itrace .ge. 1) call trace(1,11,0,3,(/x(2),dxi,delm/))
        mit = mit + 1
-       print *,'mit=', mit
+       if (blewup()) then
+         write(*,'(1x,"Solution blew up at x = ",f10.6,": dxi = ",
+     1     g12.5," is too large")') x(2),dxi
+         stop 1
+       end if
        if (march) then
          if (x(2).gt.xplot) then
            call prnter
@@ -77,14 +135,18 @@ c      set initial conditions
          if (delm .le. 0.00001) then
            convrg = .true.
            print *,'converged at iteration = ',mit
-         else if (mit .eq. mitmax) then
+         else if (mit .ge. nitmax) then
            convrg = .true.
            print *,'Run stopped at nitmax = ',nitmax
          end if
          if (convrg) then
-           write(*,'(1x, "Release for marching (y/n)")')
-           read(*,'(1a1)') flag
-           march = ((flag .eq. 'y') .or. (flag .eq. 'Y'))
+           if (irelse .ne. 0) then
+             march = (irelse .ge. 2) .or. (delm .le. 0.00001)
+           else
+             write(*,'(1x, "Release for marching (y/n)")')
+             read(*,'(1a1)') flag
+             march = ((flag .eq. 'y') .or. (flag .eq. 'Y'))
+           end if
            if (.not. march) go to 300
            print *,'marching...'
            call prnter
@@ -1,17 +1,20 @@
       subroutine solve(i)
-        logical march, betlok
-        include "common.inc"
+        use rrstate
         xk = hinf-.5*(cc/aa)**2
-        print *,aa,bb,cc
+        if (itrace .ge. 2) call trace(2,9,i,3,(/aa,bb,cc/))
         phi=.8*xk*aa*aa/(1.4*bb*bb)
-        print *,"phi=",phi
+        if (itrace .ge. 3) call trace(3,10,i,1,(/phi/))
         phm = 1.4/2.4
         phs = 0.95*phm
         if(phi.gt.phs) betlok=.true.
         if((i.eq.2).and. betlok) phi = phm
         rad=0.
-        if(phi.le.phm) rad=sqrt(1.-phi-phi/1.4)
+c       clip roundoff at the sonic limit, where the root is zero
+        if(phi.le.phm) rad=sqrt(max(0.,1.-phi-phi/1.4))
         den=1.4*phi-.4
+c       keep off a zero divide at phi = 2/7: the Mach number is then
+c       huge but finite, so the values below stay finite too
+        if(abs(den).lt.1.e-12) den=sign(1.e-12,den)
         xmx = (1.-phi+rad)/den
         pp = bb/(1.+1.4*xmx)
         t = xk/(1.+.2*xmx)
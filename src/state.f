@@ -0,0 +1,24 @@
+      module rrstate
+c       solver state shared by the rrbaxi routines (was blank COMMON)
+c       the flow field arrays are sized from neta when the run starts,
+c       or point at a caller's arrays (see bridge.f)
+        real, pointer :: r(:) => null(), u(:) => null(),
+     1    v(:) => null(), p(:) => null(), eta(:) => null()
+c       predicted pressures, kept only for a caller that asks (bridge.f)
+        real, pointer :: ppred(:) => null()
+        real xminf,hinf,xmuinf,beta,pinf
+        real xl1,xl2,xh,rn,x0,thetas,thetab
+        real rb(2),rs(2),rbx(2),rsx(2),x(2)
+        real aa,bb,cc,rr,uu,vv,pp
+        real deta,xmu1,xmu2,dxi,dximax,delm
+        logical march,betlok
+        integer mit,nplot,nitmax,neta,nem1
+        integer itrace,itrlo,itrhi,itslo,itshi,ntrace,iclear
+      contains
+        subroutine alloc(n)
+c         size the flow field arrays for n grid points
+          integer n
+          allocate(r(n),u(n),v(n),p(n),eta(n))
+          return
+        end subroutine
+      end module
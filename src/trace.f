@@ -0,0 +1,21 @@
+      subroutine trace(lev,itag,ipt,n,vals)
+c       write one debug trace record (see test/Trace.py for the tags)
+        use rrstate
+        dimension vals(n)
+        character*8 tags(14)
+        data tags /'wall','wallstr','wallE','wallF','pred','e1x',
+     1    'e2x','e3x','solve','phi','step','body','E','reject'/
+        if (lev .gt. itrace) return
+c       stations count from 1, mit is bumped after each sweep
+        istn = mit + 1
+        if (istn .lt. itslo .or. istn .gt. itshi) return
+        if (ipt .gt. 0 .and. (ipt .lt. itrlo .or. ipt .gt. itrhi))
+     1    return
+        if (ntrace .gt. 0) then
+          write(ntrace) itag, istn, ipt, n, (dble(vals(k)), k=1,n)
+        else
+          write(*,'(1x,a8,2i7,5g16.8)') tags(itag), istn, ipt,
+     1      (vals(k), k=1,n)
+        end if
+        return
+      end
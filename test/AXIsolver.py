@@ -11,12 +11,38 @@
 #   (original program created in 1975 at USAF ARL Laboratories)
 
 import math
+import numpy as np
 from Body import *
 from OuterBoundary import *
+from Metrics import *
+from StepControl import *
+from Accelerate import *
+from Stations import *
+import Checkpoint
+import ConeCache
+import MacCormack
+import Engines
+import Trace
+
+def robertsGrid(neta,beta):
+    '''Return neta eta values from 0 to 1 clustered toward eta = 0
+
+    Roberts' stretching of a uniform grid zeta; beta > 1, with the
+    points packed tighter against the wall as beta nears 1.
+    '''
+    zeta = np.linspace(0.0,1.0,neta)
+    q = ((beta + 1.0)/(beta - 1.0))**(1.0 - zeta)
+    eta = ((beta + 1.0) - (beta - 1.0)*q)/(q + 1.0)
+    eta[0] = 0.0
+    eta[-1] = 1.0
+    return eta
 
 class AXIsolver:
     '''Axisymettric Parabolozed Navier Stokes Solver'''
 
+    # rows of the flow field state block
+    STATE = ('eta','rho','u','v','p','f1','f2','data1','data2','ppred')
+
     def __init__(self,values):
         '''Initialize solver with input values'''
         self.values = values
@@ -33,18 +59,7 @@ class AXIsolver:
         self.mit     = 0
         self.betloc  = False
         self.doprint = True
-
-        # create empty lists for the variables
-        self.eta = []
-        self.rho = []
-        self.u   = []
-        self.v   = []
-        self.p   = []
-
-        self.f1  = []
-        self.f2  = []
-        self.data1 = []
-        self.data2 = []
+        self.warm    = False
 
         # Useful math constants
         pi  = math.acos(-1.0)
@@ -85,8 +100,58 @@ class AXIsolver:
         # computational grid definitions
         self.dxi    = self.values['dxi']
         self.neta   = self.values['neta']
+        # the march can start at its own step: the implicit engine
+        # marches far past the dxi the tangent cone converges at
+        self.marchdxi = self.values.get('marchdxi')
         self.nitmax = self.values['nitmax']
 
+        # flow field precision: 'double' or 'single'
+        self.dtype = np.float64
+        if self.values.get('precision','double') == 'single':
+            self.dtype = np.float32
+
+        # marching engine from the Engines registry: 'scalar' point by
+        # point, 'numpy' whole column, 'implicit' whole column implicit
+        # step, 'fortran' the compiled precor (make lib), or 'auto'
+        self.engine = Engines.select(self.values,
+            stretched=self.values.get('grid','uniform') != 'uniform',
+            float32=self.dtype == np.float32)
+
+        # marching step control: fixed 1.005 growth or adaptive
+        self.control = None
+        if self.values.get('stepcontrol','fixed') == 'adaptive':
+            self.control = StepController(self.values,self.engine)
+        # station geometry table, set up when a fixed step march starts
+        self.stations = None
+
+        # grid sequencing: coarser neta levels to start the tangent cone on
+        self.netaseq = [n for n in self.values.get('netaseq',[])
+                        if n < self.neta]
+
+        # tangent cone accelerator: 'off' or 'extrapolate'
+        self.accel = None
+        if self.values.get('accel','off') == 'extrapolate':
+            self.accel = Extrapolator(self.values)
+
+        # converged tangent cone columns kept between runs: 'off' or 'on'
+        self.conecache = None
+        if self.values.get('conecache','off') == 'on':
+            self.conecache = ConeCache.ConeCache(self.values)
+
+        # checkpoints to resume the run from, if a file is named
+        self.checkpoint = None
+        if self.values.get('checkpoint'):
+            self.checkpoint = Checkpoint.Checkpointer(self.values)
+
+        # debug trace controls; the trace is set up once per solver, so
+        # running initSolver again keeps writing to the same file
+        if getattr(self,'trace',None) is None:
+            self.trace = Trace.Trace(self.values.get('trace',Trace.OFF),
+                            self.values.get('tracepoints'),
+                            self.values.get('tracestations'),
+                            self.values.get('tracefile'))
+        self.tpoint = False
+
         # output controls
         self.nplot  = self.values['nplot']
         self.dplot  = self.values['dplot']
@@ -95,21 +160,41 @@ class AXIsolver:
         # transformed axial step size
         self.deta   = 1.0/float(self.neta-1)
 
-        et  = -self.deta
-        self.f1 = []
-        self.f2 = []
-        for i in range ( 0,self.neta+1 ):
-            self.eta += [ et ]
-            self.rho += [ 1.0 ]
-            self.u   += [ 1.0 ]
-            self.v   += [ 0.0 ]
-            self.p   += [ self.pinf ]
-            self.f1  += [0.0]
-            self.f2  += [0.0]
-            self.data1 += [0.0]
-            self.data2 += [0.0]
-            et  = et + self.deta
-    
+        # flow field data lives in one contiguous block, one row per
+        # variable. The named attributes are views into that block.
+        self.state = np.zeros((len(self.STATE),self.neta+1),dtype=self.dtype)
+        for k, name in enumerate(self.STATE):
+            setattr(self,name,self.state[k])
+
+        # eta grid: uniform, or clustered toward the wall by Roberts'
+        # stretching. deni[i] is the inverse spacing 1/(eta[i]-eta[i-1])
+        # used by the eta differences; the dummy point 0 mirrors point 2.
+        # The march step grows by the fixed 1.005 whatever the grid, so
+        # the clustering is kept mild: with gridbeta 2 the smallest
+        # spacing is 0.83 of the uniform one and the test case runs at
+        # its own dxi. Tighter clustering (gridbeta 1.1 puts it at 0.30)
+        # needs a smaller dxi, a larger nitmax and adaptive steps, as
+        # does a finer column on either grid.
+        self.grid = self.values.get('grid','uniform')
+        self.gridbeta = self.values.get('gridbeta',2.0)
+        self.deni = np.empty(self.neta+1,dtype=self.dtype)
+        if self.grid == 'roberts':
+            self.eta[1:] = robertsGrid(self.neta,self.gridbeta)
+            self.eta[0] = 2.0*self.eta[1] - self.eta[2]
+            self.deni[1:] = 1.0/np.diff(self.eta)
+            self.deni[0] = self.deni[1]
+            self.detamin = float(np.min(np.diff(self.eta[1:])))
+        else:
+            self.eta[0]  = -self.deta
+            self.eta[1:] = self.deta
+            np.cumsum(self.eta,out=self.eta)
+            self.deni[:] = 1.0/self.deta
+            self.detamin = self.deta
+        self.rho[:]  = 1.0
+        self.u[:]    = 1.0
+        self.v[:]    = 0.0
+        self.p[:]    = self.pinf
+
         # set no slip boundary condition
         self.u[1]    = 0.0
         self.v[1]    = 0.0
@@ -125,6 +210,10 @@ class AXIsolver:
         self.xmu1    = 0.0
         self.xmu2    = 0.0
 
+        # grid metrics for the current station levels
+        self.metrics = MetricCache(self.eta)
+        self.metric  = [ None, None, None ]
+
         self.plotx1 = self.dplot
         self.plotx2 = self.dplot - self.dxi
         
@@ -136,29 +225,36 @@ class AXIsolver:
             self.x[1] = self.x[2]
             self.x[2] = self.x[1] + self.dxi
         else:
-            self.x[1] = self.x0 / self.xl2 - self.dxi
-            self.x[2] = self.x[1] + self.dxi
+            self.x[1], self.x[2] = self.startStations()
             
         self.xmu1 = self.xmuinf * self.x[1]
         self.xmu2 = self.xmuinf * self.x[2]
         
         # if we are marching accelerate the marching step size
-        if(self.march):
+        if(self.march and self.control is None):
             self.dxi = 1.005 * self.dxi
             self.beta = self.beta/1.005
         # now get the body and shock data
-        bl = self.mybody.bodylength
-        self.rs[1] = self.shock.body.getRadius(self.x[1]*bl)/bl
-        self.rs[2] = self.shock.body.getRadius(self.x[2]*bl)/bl
-        self.rsx[1] = self.shock.body.getSlope(self.x[1]*bl)
-        self.rsx[2] = self.shock.body.getSlope(self.x[2]*bl)
-        
- 
-            
-        self.rb[1] = self.mybody.body.getRadius(self.x[1]*bl)/bl
-        self.rb[2] = self.mybody.body.getRadius(self.x[2]*bl)/bl
-        self.rbx[1] = self.mybody.body.getSlope(self.x[1]*bl)
-        self.rbx[2] = self.mybody.body.getSlope(self.x[2]*bl)
+        for j in (1,2):
+            geom = None
+            if self.stations is not None:
+                geom = self.stations.lookup(self.x[j])
+            if geom is not None:
+                self.rb[j], self.rbx[j], rs, rsx = geom
+            else:
+                self.rb[j], self.rbx[j] = self.bodyGeometry(self.x[j])
+                rs = None
+            if rs is None:
+                rs, rsx = self.shockGeometry(self.x[j])
+            self.rs[j] = rs
+            self.rsx[j] = rsx
+
+        # grid metrics for both station levels
+        for j in (1,2):
+            self.metric[j] = self.metrics.getMetrics(self.rb[j],self.rbx[j],
+                                                     self.rs[j],self.rsx[j])
+        if self.trace.active(Trace.STEP):
+            self.trace.emit('body',0,self.rb[1],self.rs[1])
     #--------------------------------------------------------------------
 
     def printer(self,mit,delm):
@@ -188,7 +284,8 @@ class AXIsolver:
     #--------------------------------------------------------------------
     def solve(self,i,aa,bb,cc):
         '''Reduce Solution vector to primitive values'''
-        print(aa,bb,cc)
+        if self.tpoint and self.trace.want(i):
+            self.trace.emit('solve',i,aa,bb,cc)
         xk = self.hinf - 0.5*(cc/aa)**2
         phi = 0.8 * xk * aa * aa/(1.4 * bb * bb)
         phm = 1.4/2.4
@@ -213,7 +310,13 @@ class AXIsolver:
     def precor(self):
         '''MacCormack's Predictor Corrector Solver'''
         w = [ [ 0,0,0,0 ], [ 0,0,0,0 ], [ 0,0,0,0 ], [ 0,0,0,0 ], [0,0,0,0 ] ]
-
+        xe = [ None ] * (self.neta+1)
+        m1 = self.metric[1]
+        m2 = self.metric[2]
+        trace = self.trace
+        deni = self.deni.tolist()
+        self.tpoint = tpoint = trace.active(Trace.POINT)
+        tdetail = trace.active(Trace.DETAIL)
 
         # main predictor corrector sweep            
         for i in range (2,self.neta+1):
@@ -227,16 +330,16 @@ class AXIsolver:
                 w[4][3] = self.pinf
             else:
                 # Flowfield point - predictor ( 2 - neta-1 )
-                r1 = self.rb[1] + self.eta[i]*(self.rs[1]-self.rb[1])
-                r1p = self.rb[1] +self.eta[i+1]*(self.rs[1]-self.rb[1])
+                r1 = m1.r[i]
+                r1p = m1.r[i+1]
                 ep1 = self.rho[i]*self.u[i]*r1
                 ep2 = ep1 * self.u[i]+self.p[i]*r1
                 ep3 = ep1*self.v[i]
-                etar = 1.0/(self.rs[1]-self.rb[1])
+                xe[i] = (ep1,ep2,ep3)
+                etar = m1.etar
                 if(i == 2):
-                    etaxm=((self.eta[i]-1.0)*self.rbx[1] -
-                            self.eta[i]*self.rsx[1])*etar
-                    den1 = 1./self.deta
+                    etaxm = m1.etax[i]
+                    den1 = deni[i]
                     uetam = (self.u[i]-self.u[i-1])*den1
                     vetam = (self.v[i]-self.v[i-1])*den1
                     deldvm = etaxm*uetam+etar*vetam+self.v[i]/r1
@@ -246,20 +349,22 @@ class AXIsolver:
                     trrm = 2.0*self.xmu1*etar*vetam - \
                         2.0/3.0*self.xmu1*self.beta*deldvm
                     e1p = self.rho[i]*self.u[i]*r1
-                    print(etaxm,den1,uetam,vetam)
-                    print(deldvm,txxm,sigxrm,trrm)
+                    if tdetail and trace.want(i):
+                        trace.emit('wall',i,etaxm,den1,uetam,vetam)
+                        trace.emit('wallstr',i,deldvm,txxm,sigxrm,trrm)
                     e2p = e1p*self.u[i]+self.p[i]*r1-txxm*r1
                     e3p = e1p*self.v[i]-sigxrm*r1
                     f1p = self.rho[i]*self.v[i]*r1
                     f2p = f1p*self.u[i]-sigxrm*r1
                     f3p = f1p*self.v[i]+self.p[i]*r1-trrm*r1
-                    print(e1p,e2p,e3p)
-                    print(f1p,f2p,f3p)
+                    if tdetail and trace.want(i):
+                        trace.emit('wallE',i,e1p,e2p,e3p)
+                        trace.emit('wallF',i,f1p,f2p,f3p)
                 if(i>2):
                     etaxm=etaxpp
-                etaxp = ((self.eta[i+1]-1.0)*self.rbx[1] - \
-                            self.eta[i+1]*self.rsx[1])*etar 
+                etaxp = m1.etax[i+1]
                 etaxpp=etaxp
+                den1 = deni[i+1]
                 uetap = (self.u[i+1]-self.u[i])*den1
                 vetap = (self.v[i+1]-self.v[i])*den1
                 if(i>2):
@@ -294,17 +399,20 @@ class AXIsolver:
                     self.dxi*etar*den1*(f2p-f2m)+self.dxi*h2
                 ep3 = ep3 -self.dxi*etaxm*den1*(e3p-e3m) - \
                     self.dxi*etar*den1*(f3p-f3m)+self.dxi*h3
-                r2 = self.rb[2]+self.eta[i]*(self.rs[2]-self.rb[2])
-                print('a',ep1,ep2,ep3)
-                print('b',e1m,e1p)
-                print('c',e2m,e2p)
-                print('d',e3m,e3p)
+                r2 = m2.r[i]
+                if tpoint and trace.want(i):
+                    trace.emit('pred',i,ep1,ep2,ep3)
+                    if tdetail:
+                        trace.emit('e1x',i,e1m,e1p)
+                        trace.emit('e2x',i,e2m,e2p)
+                        trace.emit('e3x',i,e3m,e3p)
 
                 aa = ep1/r2
                 bb = ep2/r2
                 cc = ep3/r2
                 # solve for primative variables and store in work area
                 self.solve(i,aa,bb,cc)
+                self.ppred[i] = self.pp
                 for j in range (1,5):
                     w[j][1] = w[j][2]
                     w[j][2] = w[j][3]
@@ -314,19 +422,17 @@ class AXIsolver:
                 w[4][3] = self.pp
             if(i != 2):
                 # Corrector - lags one point
-                r1 = self.rb[1] + self.eta[i-1]*(self.rs[1]-self.rb[1])
-                xep1 = self.rho[i-1]*self.u[i-1]*r1
-                xep2 = xep1 * self.u[i-1]+self.p[i-1]*r1
-                xep3 = xep1*self.v[i-1]
-                r2 = self.rb[2] + self.eta[i-1]*(self.rs[2]-self.rb[2])
-                r2m = self.rb[2] + self.eta[i-2]*(self.rs[2]-self.rb[2])
+                # level 1 inviscid flux saved by the predictor
+                xep1, xep2, xep3 = xe[i-1]
+                r2 = m2.r[i-1]
+                r2m = m2.r[i-2]
                 ep1 = w[1][2]*w[2][2]*r2
                 ep2 = ep1*w[2][2]+w[4][2]*r2
                 ep3 = ep1*w[3][2]
-                etar = 1.0/(self.rs[2]-self.rb[2])
+                etar = m2.etar
                 if(i == 3):
-                    etaxm=((self.eta[i-2]-1.0)*self.rbx[2]- \
-                                self.eta[i-2]*self.rsx[2])*etar
+                    etaxm = m2.etax[i-2]
+                    den1 = deni[i-1]
                     uetam = (w[2][2]-w[2][1])*den1
                     vetam = (w[3][2]-w[3][1])*den1
                     deldvm = etaxm*uetam+etar*vetam+w[3][1]/r2m
@@ -341,8 +447,8 @@ class AXIsolver:
                     f1pc = w[1][1]*w[3][1]*r2m
                     f2pc = f1pc*w[2][1]-sigxrm*r2m
                     f3pc = f1pc*w[3][1]+w[4][1]*r2m-trrm*r2m
-                etaxp = ((self.eta[i-1]-1.0)*self.rbx[2]- \
-                            self.eta[i-1]*self.rsx[2])*etar 
+                etaxp = m2.etax[i-1]
+                den1 = deni[i]
                 uetap = (w[2][3]-w[2][2])*den1
                 vetap = (w[3][3]-w[3][2])*den1
                 deldvp = etaxp*uetap+etar*vetap+w[3][2]*r2
@@ -370,6 +476,7 @@ class AXIsolver:
                 h3 = -sigpp
                 h2 = 0.0
                 h1 = 0.0
+                den1 = deni[i-1]
                 ep1 = 0.5*(ep1 + xep1-self.dxi*etaxp*den1*(e1pc-e1mc) \
                     -self.dxi*etar*den1*(f1pc-f1mc)+self.dxi*h1)
                       
@@ -402,43 +509,294 @@ class AXIsolver:
         self.rho[1] = 1.4*self.p[1]/(0.4*self.hinf)
         
     #--------------------------------------------------------------------
+    def precorColumn(self,kernel=MacCormack.precor):
+        '''Advance the whole column with a column kernel
+
+        The default kernel is the whole column version of MacCormack's
+        Predictor Corrector Solver.
+        '''
+        delm, betloc = kernel(self.eta,self.rho,self.u,self.v,
+                self.p,self.metric[1],self.metric[2],self.dxi,self.xmu1,self.beta,self.hinf,
+                self.pinf,self.deni,self.betloc,self.trace,self.ppred)
+        self.betloc = bool(betloc)
+        if(delm > self.delm):
+            self.delm = float(delm)
 
-    def runSolver(self):
-        # Main computational loop
-        mit = 0
-        if self.doprint > 0:
-            self.printer(mit,self.delm)
-        convrg = False
-        while convrg == False:
-            self.delm = 0.0
+    #--------------------------------------------------------------------
+    def advance(self):
+        '''Take one step with the selected engine'''
+        self.engine.advance(self)
+
+    def saveStep(self):
+        '''Save what a marching step changes so it can be retried'''
+        return (self.state.copy(), self.betloc, list(self.x),
+                list(self.rb), list(self.rbx), list(self.rs), list(self.rsx),
+                list(self.metric))
+
+    def restoreStep(self,saved):
+        '''Put back the solver as saved, keeping the new step size'''
+        self.state[:] = saved[0]
+        self.betloc = saved[1]
+        self.x[:]   = saved[2]
+        self.rb[:]  = saved[3]
+        self.rbx[:] = saved[4]
+        self.rs[:]  = saved[5]
+        self.rsx[:] = saved[6]
+        self.metric[:] = saved[7]
+
+    def controlledStep(self):
+        '''Take one marching step, retrying until the controller accepts'''
+        saved = self.saveStep()
+        while True:
             self.body()
-            self.precor()
+            self.advance()
+            if self.control.accept(self):
+                return
+            if self.trace.active(Trace.STEP):
+                self.trace.emit('reject',0,self.x[2],self.dxi,self.control.err)
+            self.restoreStep(saved)
+            self.delm = 0.0
+
+    def blewUp(self):
+        '''Return True, and say so, if the column has gone bad
+
+        A bad column has values that are not finite, or a density,
+        pressure or temperature that is not positive.
+        '''
+        rho, u, v, p = self.state[1:5,1:]
+        t = self.hinf - 0.5*(u*u + v*v)
+        if np.all(np.isfinite(p)) and \
+                np.all((rho > 0.0) & (p > 0.0) & (t > 0.0)):
+            return False
+        print("Solution blew up at x = %10.6f: dxi = %g is too large" % \
+            (self.x[2],self.dxi))
+        return True
+
+    #--------------------------------------------------------------------
+
+    def acceleratedSweep(self):
+        '''Take one tangent cone sweep and hand it to the accelerator'''
+        old = self.accel.column(self)
+        self.body()
+        self.advance()
+        self.accel.update(self,old)
+
+    def tangentCone(self,mit=0):
+        '''Iterate the tangent cone solution at the starting station
+
+        Returns the number of sweeps taken. march is set if the
+        iteration converged before nitmax sweeps; it stops early if the
+        column blows up. A resumed run passes the sweeps it has already
+        taken.
+        '''
+        if self.netaseq and mit == 0:
+            self.sequenceStart()
+        while True:
+            self.delm = 0.0
+            self.trace.setStation(mit+1)
+            if self.warm:
+                old = self.p.copy()
+            if self.accel is not None:
+                self.acceleratedSweep()
+            else:
+                self.body()
+                self.advance()
+            if self.warm:
+                # a warm start can come at the answer from above, so it
+                # converges on the largest pressure change either way
+                self.delm = max(self.delm,
+                                float(np.max(np.abs(self.p[2:] - old[2:]))))
             mit = mit + 1
-            if(self.march):
-                if(self.x[2] > 1.0 - self.dxi):
-                        convrg = True
-                        print("Solution ending at x = %10.6f\n" % self.x[2])
-                elif(self.x[2] > self.xplot):
-                    if self.doprint > 0:
-                        self.printer(mit,self.delm)
-                    self.xplot = self.xplot+self.dplot
-                    
+            if self.blewUp():
+                return mit
+            if self.trace.active(Trace.STEP):
+                self.trace.emit('step',0,self.x[2],self.dxi,self.delm)
+            if((mit/self.nplot*self.nplot) == mit):
+                if self.doprint >0:
+                    self.printer(mit,self.delm)
+            if(self.delm <= 0.0001):
+                self.march = True
+                return mit
+            if(mit >= self.nitmax):
+                return mit
+            if self.checkpoint is not None:
+                self.checkpoint.step(self,mit)
+
+    def sequenceStart(self):
+        '''Start from a tangent cone solution on the next coarser grid
+
+        The coarse solver does the same for its own coarser levels. Its
+        dxi is stretched with the grid spacing, holding beta*dxi fixed,
+        so each coarse sweep covers more pseudo time. Coarse levels run
+        without the accelerator.
+        '''
+        n = self.netaseq[-1]
+        values = dict(self.values)
+        values['neta'] = n
+        values['netaseq'] = self.netaseq[:-1]
+        values['dxi'] = self.dxi*float(self.neta-1)/float(n-1)
+        values['accel'] = 'off'
+        values['trace'] = Trace.OFF
+        values['checkpoint'] = None
+        values['conecache'] = 'off'
+        coarse = AXIsolver(values)
+        coarse.beta = self.beta*self.dxi/coarse.dxi
+        coarse.setBody(self.mybody)
+        coarse.setShock(self.shock)
+        coarse.doprint = 0
+        mit = coarse.tangentCone()
+        print("Grid level neta = %3d: %4d sweeps" % (n,mit))
+        for name in ('rho','u','v','p'):
+            if not np.all(np.isfinite(getattr(coarse,name))):
+                return
+        for name in ('rho','u','v','p'):
+            getattr(self,name)[1:] = np.interp(self.eta[1:],coarse.eta[1:],
+                                               getattr(coarse,name)[1:])
+        self.betloc = coarse.betloc
+
+    def plainSweeps(self):
+        '''Return the sweeps the unaccelerated tangent cone iteration takes'''
+        values = dict(self.values)
+        values['accel'] = 'off'
+        values['netaseq'] = []
+        values['trace'] = Trace.OFF
+        values['checkpoint'] = None
+        values['conecache'] = 'off'
+        plain = AXIsolver(values)
+        plain.setBody(self.mybody)
+        plain.setShock(self.shock)
+        plain.doprint = 0
+        return plain.tangentCone()
+
+    def marchSolution(self,mit,resumed=False):
+        '''March from the starting station to the end of the body
+
+        A resumed run has its station table and fitted shock back from
+        the checkpoint.
+        '''
+        # fixed steps follow a known schedule, so the station geometry
+        # is set up for the whole march at once; a fitted shock moves
+        # with the solution, so then only the body part can be
+        fitted = isinstance(self.shock,ShockFit)
+        if fitted and not resumed:
+            self.shock.reset()
+        if self.marchdxi is not None and not resumed:
+            # hold beta*dxi fixed, as the step growth does
+            self.beta = self.beta*self.dxi/self.marchdxi
+            self.dxi = self.marchdxi
+        if self.control is None and not resumed:
+            self.stations = StationTable(self.mybody,
+                                         None if fitted else self.shock,
+                                         self.x[2],self.dxi)
+        while True:
+            self.delm = 0.0
+            self.trace.setStation(mit+1)
+            if self.control is not None:
+                self.controlledStep()
             else:
-                if((mit/self.nplot*self.nplot) == mit):
-                    if self.doprint >0:
-                        self.printer(mit,self.delm)
-                if(self.delm <= 0.0001):
-                    print("Converged on iteration %4d" % ( self.mit ))
-                    self.march = True
-                else:
-                    if(mit >= self.nitmax):
-                        convrg = True
-                        print("Run stopped (nitmax = %4d)" % self.nitmax)
+                self.body()
+                self.advance()
+            mit = mit + 1
+            if self.blewUp():
+                return mit
+            if fitted:
+                self.shock.update(self)
+            if self.trace.active(Trace.STEP):
+                self.trace.emit('step',0,self.x[2],self.dxi,self.delm)
+            if(self.x[2] > 1.0 - self.dxi):
+                print("Solution ending at x = %10.6f\n" % self.x[2])
+                if self.control is not None:
+                    print("Adaptive marching: %d steps, %d rejected" % \
+                        (self.control.naccept,self.control.nreject))
+                return mit
+            elif(self.x[2] > self.xplot):
+                if self.doprint > 0:
+                    self.printer(mit,self.delm)
+                self.xplot = self.xplot+self.dplot
+            if self.checkpoint is not None:
+                self.checkpoint.step(self,mit)
+
+    def runSolver(self,mit=0):
+        # Main computational loop; a resumed run comes in with the
+        # steps it has already taken. Returns the steps taken in all.
+        if self.march:
+            mit = self.marchSolution(mit,True)
+            self.trace.close()
+            return mit
+        if self.doprint > 0 and mit == 0:
+            self.printer(mit,self.delm)
+        cached = None
+        if self.conecache is not None and mit == 0:
+            cached = self.conecache.load(self)
+            if cached is None:
+                near = self.conecache.warmStart(self)
+                self.warm = near is not None
+                if self.warm:
+                    print("Tangent cone warm start from cache (%.4f away)" % near)
+        if cached is not None:
+            mit = cached
+            self.march = True
+            print("Tangent cone from cache (%d sweeps)" % mit)
+        else:
+            mit = self.tangentCone(mit)
+            if self.conecache is not None and self.march:
+                self.conecache.store(self,mit)
+        if self.accel is not None and cached is None:
+            print("Tangent cone: %d sweeps, %d extrapolations, %d rejected" % \
+                (mit,self.accel.nextrap,self.accel.nreject))
+            if self.values.get('accelcompare',False):
+                plain = self.plainSweeps()
+                print("Plain iteration: %d sweeps, %d saved" % \
+                    (plain,plain-mit))
+        if(self.march):
+            print("Converged on iteration %4d" % ( self.mit ))
+            mit = self.marchSolution(mit)
+        elif mit >= self.nitmax:
+            print("Run stopped (nitmax = %4d)" % self.nitmax)
+        self.trace.close()
+        return mit
+
+    def resume(self,checkpoint):
+        '''Continue the run saved in a checkpoint file
+
+        The solver must be set up for the same case as the run that
+        saved it, body and outer boundary included. Returns the steps
+        taken in all.
+        '''
+        return self.runSolver(Checkpoint.restore(self,checkpoint))
 
     def setBody(self,body):
         '''Set the body for this solution'''
         self.mybody = body
 
+    def startX(self):
+        '''Return the tangent cone station as a fraction of the body length
+
+        Bodies that carry an xstart start there; otherwise the station
+        is the end of the test body's conical tip.
+        '''
+        xstart = getattr(self.mybody,'xstart',None)
+        if xstart is None:
+            return self.x0 / self.xl2
+        return xstart / self.mybody.bodylength
+
+    def startStations(self):
+        '''Return the two station levels of the tangent cone iteration'''
+        x1 = self.startX() - self.dxi
+        return x1, x1 + self.dxi
+
+    def bodyGeometry(self,x):
+        '''Return the body radius and slope at station x'''
+        bl = self.mybody.bodylength
+        rb, rbx, curve = self.mybody.body.evaluate(x*bl)
+        return rb/bl, rbx
+
+    def shockGeometry(self,x):
+        '''Return the outer boundary radius and slope at station x'''
+        bl = self.mybody.bodylength
+        rs, rsx, curve = self.shock.body.evaluate(x*bl)
+        return rs/bl, rsx
+
     def setShock(self,shock):
         '''Set the outer boundary for this solution'''
         self.shock = shock
@@ -509,16 +867,14 @@ class AXIsolver:
         else:
             rs1 = self.plotter.height*dxi
             rs2 = self.plotter.height*dxi
-        deta1 = (rs1 - rb1)/float(self.neta-1)
-        deta2 = (rs2 - rb2)/float(self.neta-1)
         xp1 = self.plotx1/dxi
         xp2 = self.plotx2/dxi
         # now loop over the neta polygons
         yp1 = self.plotter.height - rb1/dxi
         yp2 = self.plotter.height - rb2/dxi
         for ny in range(self.neta-1):
-            yp3 = self.plotter.height - (float(ny+1)*deta1 + rb1)/dxi
-            yp4 = self.plotter.height - (float(ny+1)*deta2 + rb2)/dxi
+            yp3 = self.plotter.height - (self.eta[ny+2]*(rs1-rb1) + rb1)/dxi
+            yp4 = self.plotter.height - (self.eta[ny+2]*(rs2-rb2) + rb2)/dxi
             # draw the polygon
             dvalue = (self.f1[ny]+self.f2[ny]+self.f1[ny+1]+self.f2[ny+1])/4.0
             dvalue = (dvalue - minval)*scaleval
@@ -545,6 +901,7 @@ if __name__ == '__main__':
     v['nitmax'] = 750
     v['nplot']  = 25
     v['dplot']  = 0.05
+    v['engine'] = 'scalar'
 
     # create a solver object
     solver          = AXIsolver(v)
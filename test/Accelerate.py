@@ -0,0 +1,112 @@
+#--------------------------------------------------------------------
+# File:     Accelerate.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Tangent cone iteration accelerator
+#   The tangent cone start repeats the marching step at one station
+#   until the column stops changing. Once the shock has formed, the
+#   sweeps converge linearly, with the change from one sweep to the
+#   next shrinking by a nearly constant factor lam. The limit is then
+#   about
+#
+#       x + d * lam/(1 - lam)
+#
+#   where d is the last change, so every few sweeps the column is
+#   extrapolated along d. lam is estimated from the last three changes
+#   and only trusted when consecutive estimates agree. An extrapolated
+#   column that makes the next sweep change more than the last one did
+#   is thrown away.
+#
+#   Anderson mixing over the last k columns was tried first; the
+#   captured shock and the sonic lock make the sweep too far from
+#   linear for it, and it stalled or blew up on the test case.
+#
+#   Settings come from the solver values:
+#       accel       'off' (default) or 'extrapolate'
+#       accelcycle  sweeps between extrapolations          (5)
+#       accelmax    largest extrapolation factor           (10.0)
+#       acceltol    allowed change in lam, relative to 1-lam (0.2)
+#       accelcompare also run the plain iteration and report the
+#                   sweeps saved                           (False)
+
+import numpy as np
+
+class Extrapolator:
+    '''Extrapolate the tangent cone sweeps to their limit'''
+
+    # rows of the solver state that are iterated
+    ROWS = ('rho','u','v','p')
+
+    def __init__(self,values):
+        '''CONSTRUCTOR - read the accelerator settings'''
+        self.cycle = values.get('accelcycle',5)
+        self.fmax  = values.get('accelmax',10.0)
+        self.tol   = values.get('acceltol',0.2)
+        self.diffs = []
+        self.saved = None
+        self.nsweep = 0
+        self.nextrap = 0
+        self.nreject = 0
+
+    def change(self,solver,old):
+        '''Return the scaled change of the field points over one sweep'''
+        s = slice(2,solver.neta)
+        d = [getattr(solver,name)[s] - old[k] for k, name in
+                enumerate(self.ROWS)]
+        d[3] = d[3]/solver.pinf
+        return np.concatenate(d)
+
+    def column(self,solver):
+        '''Return a copy of the field points that are iterated'''
+        s = slice(2,solver.neta)
+        return [getattr(solver,name)[s].copy() for name in self.ROWS]
+
+    def update(self,solver,old):
+        '''Look at the sweep that took old to the solver state
+
+        Either keeps the sweep, extrapolates from it, or - if the sweep
+        followed a bad extrapolation - puts back the state from before
+        that extrapolation.
+        '''
+        self.nsweep += 1
+        d = self.change(solver,old)
+        dnorm = np.linalg.norm(d)
+        if self.saved is not None:
+            state, betloc, delm, last = self.saved
+            self.saved = None
+            if not np.isfinite(dnorm) or dnorm > 2.0*last:
+                solver.state[:] = state
+                solver.betloc = betloc
+                solver.delm = delm
+                self.nreject += 1
+                self.diffs = []
+                return
+        if not np.isfinite(dnorm):
+            self.diffs = []
+            return
+        self.diffs = (self.diffs + [d])[-3:]
+        if len(self.diffs) < 3 or self.nsweep % self.cycle != 0:
+            return
+        d0, d1, d2 = self.diffs
+        lam0 = np.dot(d1,d0)/np.dot(d0,d0)
+        lam1 = np.dot(d2,d1)/np.dot(d1,d1)
+        if not (0.0 < lam1 < 1.0 and abs(lam1-lam0) < self.tol*(1.0-lam1)):
+            return
+        factor = min(lam1/(1.0-lam1),self.fmax)
+        self.saved = (solver.state.copy(),solver.betloc,solver.delm,dnorm)
+        s = slice(2,solver.neta)
+        n = solver.neta - 2
+        for k, name in enumerate(self.ROWS):
+            step = factor*d2[k*n:(k+1)*n]
+            if name == 'p':
+                step = step*solver.pinf
+            getattr(solver,name)[s] += step
+        if np.any(solver.rho[s] <= 0.0) or np.any(solver.p[s] <= 0.0):
+            solver.state[:] = self.saved[0]
+            self.saved = None
+            return
+        self.nextrap += 1
+        self.diffs = []
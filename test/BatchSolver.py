@@ -0,0 +1,247 @@
+#--------------------------------------------------------------------
+# File:     BatchSolver.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Batched Axisymmetric Navier Stokes Solver
+#   Marches a set of free stream cases in lockstep. The flow field is
+#   held as (cases x neta) arrays and every step advances all active
+#   cases with one call to a whole-column engine that can take batches,
+#   the MacCormack one unless the first case asks for another.
+#   Each case may have its own outer boundary; a ShockFit boundary is
+#   started over when its case begins to march and turned after each
+#   of its steps, as AXIsolver.marchSolution does.
+
+import numpy as np
+from AXIsolver import *
+from Metrics import *
+import Engines
+
+class BatchSolver:
+    '''Lockstep solver for a list of input value sets'''
+
+    def __init__(self,valueList):
+        '''Initialize one solver case for each set of input values'''
+        self.values = valueList
+        self.cases = [AXIsolver(v) for v in valueList]
+        netas = set([c.neta for c in self.cases])
+        if len(netas) != 1:
+            raise ValueError("all batch cases must use the same neta")
+        for c in self.cases[1:]:
+            if not np.array_equal(c.eta,self.cases[0].eta):
+                raise ValueError("all batch cases must use the same eta grid")
+        first = self.cases[0]
+        self.engine = Engines.select(valueList[0],batch=True,
+            stretched=first.grid != 'uniform',
+            float32=first.dtype == np.float32)
+        self.shocks = None
+        self.initSolver()
+
+    def initSolver(self):
+        '''Initialize batched flow field data from the case solvers'''
+        cases = self.cases
+        self.ncases = len(cases)
+        self.neta = cases[0].neta
+        self.eta = cases[0].eta.copy()
+        self.deni = cases[0].deni.copy()
+        self.rho = np.array([c.rho for c in cases])
+        self.u   = np.array([c.u for c in cases])
+        self.v   = np.array([c.v for c in cases])
+        self.p   = np.array([c.p for c in cases])
+
+        # per-case scalars, column shaped to broadcast against the field
+        def column(name):
+            return np.array([[float(getattr(c,name))] for c in cases])
+        self.hinf   = column('hinf')
+        self.pinf   = column('pinf')
+        self.xmuinf = column('xmuinf')
+        self.dxi    = column('dxi')
+        self.beta   = column('beta')
+        self.nitmax = np.array([c.nitmax for c in cases])
+
+        # per-case state flags
+        self.march  = np.zeros(self.ncases,dtype=bool)
+        self.done   = np.zeros(self.ncases,dtype=bool)
+        self.betloc = np.zeros(self.ncases,dtype=bool)
+        self.delm   = np.zeros(self.ncases)
+        self.mit    = np.zeros(self.ncases,dtype=int)
+        self.status = ['running'] * self.ncases
+
+        # station and geometry data, indexed like the scalar solver
+        self.x   = np.zeros((3,self.ncases,1))
+        self.rb  = np.zeros((3,self.ncases,1))
+        self.rbx = np.zeros((3,self.ncases,1))
+        self.rs  = np.zeros((3,self.ncases,1))
+        self.rsx = np.zeros((3,self.ncases,1))
+        self.xmu1 = np.zeros((self.ncases,1))
+
+    def setBody(self,body):
+        '''Set the body shared by all cases'''
+        self.mybody = body
+        for c in self.cases:
+            c.setBody(body)
+        # tangent cone station, as each case's own solver would start
+        self.xstart = np.array([[c.startX()] for c in self.cases])
+
+    def setShock(self,shocks):
+        '''Set the outer boundary for each case'''
+        self.shocks = shocks
+        for c, s in zip(self.cases,shocks):
+            c.setShock(s)
+
+    def active(self):
+        '''Return a mask of cases still running'''
+        return ~self.done
+
+    def body(self):
+        '''Fill in body and shock data for the active cases'''
+        act = self.active()
+        mrch = (self.march & act)[:,None]
+        start = (~self.march & act)[:,None]
+        x1 = np.where(mrch, self.x[2], self.xstart - self.dxi)
+        x1 = np.where(mrch | start, x1, self.x[1])
+        self.x[1] = x1
+        self.x[2] = np.where(mrch | start, x1 + self.dxi, self.x[2])
+        self.xmu1 = self.xmuinf * self.x[1]
+
+        # accelerate the marching step size
+        self.dxi  = np.where(mrch, 1.005*self.dxi, self.dxi)
+        self.beta = np.where(mrch, self.beta/1.005, self.beta)
+
+        bl = self.mybody.bodylength
+        idx = np.flatnonzero(act)
+        for j in (1,2):
+            rb, rbx, curve = self.mybody.body.getGeometry(self.x[j,idx,0]*bl)
+            self.rb[j,idx,0]  = rb/bl
+            self.rbx[j,idx,0] = rbx
+        for k in idx:
+            for j in (1,2):
+                rs, self.rsx[j,k,0], curve = \
+                    self.shocks[k].body.evaluate(self.x[j,k,0]*bl)
+                self.rs[j,k,0] = rs/bl
+
+    def precor(self):
+        '''Advance all active cases one step'''
+        idx = np.flatnonzero(self.active())
+        rho = self.rho[idx]
+        u   = self.u[idx]
+        v   = self.v[idx]
+        p   = self.p[idx]
+        m1 = StationMetrics(self.eta,self.rb[1,idx],self.rbx[1,idx],
+                            self.rs[1,idx],self.rsx[1,idx])
+        m2 = StationMetrics(self.eta,self.rb[2,idx],self.rbx[2,idx],
+                            self.rs[2,idx],self.rsx[2,idx])
+        delm, betloc = self.engine.kernel(self.eta,rho,u,v,p,m1,m2,
+                self.dxi[idx],self.xmu1[idx],self.beta[idx],self.hinf[idx],
+                self.pinf[idx],self.deni,self.betloc[idx])
+        self.rho[idx] = rho
+        self.u[idx]   = u
+        self.v[idx]   = v
+        self.p[idx]   = p
+        self.betloc[idx] = betloc
+        # a case that has gone bad keeps its NaN, so it cannot pass
+        # for converged
+        self.delm[idx] = np.maximum(delm,0.0)
+
+    def blewUp(self):
+        '''Return a mask of the cases whose column has gone bad
+
+        The test is the one AXIsolver.blewUp makes: values that are not
+        finite, or a density, pressure or temperature that is not
+        positive.
+        '''
+        rho = self.rho[:,1:]
+        p = self.p[:,1:]
+        t = self.hinf - 0.5*(self.u[:,1:]**2 + self.v[:,1:]**2)
+        with np.errstate(invalid='ignore'):
+            ok = np.all(np.isfinite(p),axis=1) & \
+                np.all((rho > 0.0) & (p > 0.0) & (t > 0.0),axis=1)
+        return ~ok
+
+    def runSolver(self):
+        '''March every case until it finishes or stops'''
+        while not np.all(self.done):
+            act = self.active()
+            self.delm[act] = 0.0
+            self.body()
+            self.precor()
+            self.mit[act] += 1
+            bad = self.blewUp()
+            for k in np.flatnonzero(act):
+                if bad[k]:
+                    self.done[k] = True
+                    self.status[k] = 'diverged'
+                elif self.march[k]:
+                    self.fitShock(k)
+                    if self.x[2,k,0] > 1.0 - self.dxi[k,0]:
+                        self.done[k] = True
+                        self.status[k] = 'complete'
+                elif self.delm[k] <= 0.0001:
+                    self.march[k] = True
+                    if isinstance(self.shocks[k],ShockFit):
+                        self.shocks[k].reset()
+                    marchdxi = self.cases[k].marchdxi
+                    if marchdxi is not None:
+                        self.beta[k,0] *= self.dxi[k,0]/marchdxi
+                        self.dxi[k,0] = marchdxi
+                elif self.mit[k] >= self.nitmax[k]:
+                    self.done[k] = True
+                    self.status[k] = 'stopped'
+
+    def fitShock(self,k):
+        '''Turn case k's outer boundary if it follows the shock'''
+        shock = self.shocks[k]
+        if isinstance(shock,ShockFit):
+            bl = self.mybody.bodylength
+            shock.turn(self.x[2,k,0]*bl,self.rs[2,k,0]*bl,
+                       self.p[k,self.neta-1]/self.pinf[k,0])
+
+    def getCase(self,k):
+        '''Return a scalar solver holding the current state of case k'''
+        c = self.cases[k]
+        c.rho[:] = self.rho[k]
+        c.u[:]   = self.u[k]
+        c.v[:]   = self.v[k]
+        c.p[:]   = self.p[k]
+        c.march  = bool(self.march[k])
+        c.betloc = bool(self.betloc[k])
+        c.dxi    = self.dxi[k,0]
+        c.beta   = self.beta[k,0]
+        for j in (1,2):
+            c.x[j]   = self.x[j,k,0]
+            c.rb[j]  = self.rb[j,k,0]
+            c.rbx[j] = self.rbx[j,k,0]
+            c.rs[j]  = self.rs[j,k,0]
+            c.rsx[j] = self.rsx[j,k,0]
+        return c
+
+if __name__ == '__main__':
+
+    # sweep the free stream Mach number about the test case
+    cases = []
+    for minf in (5.5, 5.95, 6.5):
+        v = {}
+        v['minf']   = minf
+        v['tref']   = 1464.7157
+        v['reref']  = 2179168.0
+        v['muref']  = 7.65034e-7
+        v['muinf']  = 0.00002
+        v['thetas'] = 22.0
+        v['dxi']    = 0.0004
+        v['neta']   = 31
+        v['nitmax'] = 750
+        v['nplot']  = 25
+        v['dplot']  = 0.05
+        cases.append(v)
+
+    solver = BatchSolver(cases)
+    body = OgiveCylinder()
+    solver.setBody(body)
+    solver.setShock([OuterCone(v['thetas'],body.bodylength) for v in cases])
+    solver.runSolver()
+    for k in range(solver.ncases):
+        print("Case %d (minf = %5.2f): %s after %d steps" % \
+            (k, cases[k]['minf'], solver.status[k], solver.mit[k]))
+        solver.getCase(k).printer(solver.mit[k],solver.delm[k])
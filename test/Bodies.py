@@ -0,0 +1,238 @@
+#--------------------------------------------------------------------
+# File:     Bodies.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Analytic body catalog
+#   Body families with closed form radius, slope and curvature, worked
+#   over whole arrays of x. Each body is a nose of length L and base
+#   radius R, optionally followed by a cylinder of length lcyl:
+#
+#       haack       von Karman (C = 0) or LV-Haack (C = 1/3) ogive
+#                       theta = acos(1 - 2x/L)
+#                       r = R sqrt((theta - sin(2 theta)/2 + C sin^3 theta)/pi)
+#       powerlaw    r = R (x/L)^n
+#       spherecone  sphere of radius rn, then a cone of half angle
+#                   thetac out to radius R; L follows from these
+#       ogive       tangent ogive, r = sqrt(rho^2 - (L-x)^2) + R - rho
+#                       with rho = (R^2 + L^2)/(2R)
+#
+#   A body is its own geometry object: body.body is the body, so it can
+#   be handed to AXIsolver.setBody like OgiveCylinder. xstart is the x
+#   of the tangent cone starting station; it must be far enough from
+#   the nose for the flow there to be close to conical.
+#
+#   key is a hash of the family and its parameters, for caching
+#   results of design sweeps.
+
+import hashlib
+import math
+from abc import ABC, abstractmethod
+import numpy as np
+from Body import BodyShape
+from PiecewisePoly import OFFCURVE
+
+def paramHash(family,params):
+    '''Return a hash of a body family and its parameters'''
+    text = family + ':' + ','.join(['%s=%r' % (k, float(params[k]))
+                                    for k in sorted(params)])
+    return hashlib.sha256(text.encode()).hexdigest()
+
+class AnalyticBody(BodyShape,ABC):
+    '''Nose of closed form shape followed by an optional cylinder
+
+    A family sets its name in family and gives the nose shape.
+    '''
+
+    family = None
+
+    def __init__(self,length,radius,lcyl=0.0,xstart=None,**params):
+        '''CONSTRUCTOR - set the nose length, base radius and cylinder'''
+        if self.family is None:
+            raise TypeError("%s does not name its body family" % \
+                type(self).__name__)
+        self.length = float(length)
+        self.radius = float(radius)
+        self.lcyl = float(lcyl)
+        self.bodylength = self.length + self.lcyl
+        self.body = self
+        if xstart is None:
+            xstart = 0.1*self.length
+        self.xstart = float(xstart)
+        params.update(length=self.length,radius=self.radius,
+                      lcyl=self.lcyl,xstart=self.xstart)
+        self.params = params
+        self.key = paramHash(self.family,params)
+        self.name = self.family
+
+    @abstractmethod
+    def nose(self,x):
+        '''Return radius, slope and curvature over the nose'''
+
+    def getGeometry(self,x):
+        '''Return radius, slope and curvature arrays for an array of x
+
+        Points off the body come back as NaN.
+        '''
+        x = np.asarray(x,dtype=float)
+        onnose = (x >= 0.0) & (x <= self.length)
+        xn = np.where(onnose,x,0.5*self.length)
+        with np.errstate(divide='ignore',invalid='ignore'):
+            r, rx, rxx = self.nose(xn)
+        oncyl = (x > self.length) & (x <= self.bodylength)
+        nan = np.nan
+        r = np.where(onnose,r,np.where(oncyl,self.radius,nan))
+        rx = np.where(onnose,rx,np.where(oncyl,0.0,nan))
+        rxx = np.where(onnose,rxx,np.where(oncyl,0.0,nan))
+        return r, rx, rxx
+
+    def evaluate(self,x):
+        '''Return radius, slope and curvature for any given x
+
+        An x off the body gets the OFFCURVE values.
+        '''
+        if not (0.0 <= x <= self.bodylength):
+            return OFFCURVE
+        r, rx, rxx = self.getGeometry(x)
+        return float(r), float(rx), float(rxx)
+
+    def getRadius(self,x):
+        '''Return radius for any given x'''
+        return self.evaluate(x)[0]
+
+    def getSlope(self,x):
+        '''Return slope for any given x'''
+        return self.evaluate(x)[1]
+
+    def getCurvature(self,x):
+        '''Return curvature for any given x'''
+        return self.evaluate(x)[2]
+
+class HaackBody(AnalyticBody):
+    '''Haack series ogive; C = 0 is the von Karman ogive'''
+
+    family = 'haack'
+
+    def __init__(self,length,radius,C=0.0,lcyl=0.0,xstart=None):
+        '''CONSTRUCTOR - Haack ogive with shape parameter C'''
+        self.C = float(C)
+        AnalyticBody.__init__(self,length,radius,lcyl,xstart,C=self.C)
+        if self.C == 0.0:
+            self.name = 'von Karman ogive'
+
+    def nose(self,x):
+        '''Return radius, slope and curvature over the nose'''
+        a = self.radius/math.sqrt(math.pi)
+        C = self.C
+        th = np.arccos(1.0 - 2.0*x/self.length)
+        s = np.sin(th)
+        c = np.cos(th)
+        g = th - s*c + C*s**3
+        g1 = 2.0*s*s + 3.0*C*s*s*c
+        g2 = 4.0*s*c + 3.0*C*(2.0*s*c*c - s**3)
+        t1 = 2.0/(self.length*s)
+        t2 = -c*t1*t1/s
+        r = a*np.sqrt(g)
+        rx = a*g1*t1/(2.0*np.sqrt(g))
+        rxx = a*((g2*t1*t1 + g1*t2)/(2.0*np.sqrt(g))
+                 - (g1*t1)**2/(4.0*g**1.5))
+        return r, rx, rxx
+
+class PowerLawBody(AnalyticBody):
+    '''Power law body r = R (x/L)^n'''
+
+    family = 'powerlaw'
+
+    def __init__(self,length,radius,n=0.75,lcyl=0.0,xstart=None):
+        '''CONSTRUCTOR - power law body with exponent n'''
+        self.n = float(n)
+        AnalyticBody.__init__(self,length,radius,lcyl,xstart,n=self.n)
+
+    def nose(self,x):
+        '''Return radius, slope and curvature over the nose'''
+        n = self.n
+        xl = x/self.length
+        r = self.radius*xl**n
+        rx = n*self.radius/self.length*xl**(n-1.0)
+        rxx = n*(n-1.0)*self.radius/self.length**2*xl**(n-2.0)
+        return r, rx, rxx
+
+class SphereCone(AnalyticBody):
+    '''Sphere capped cone'''
+
+    family = 'spherecone'
+
+    def __init__(self,rnose,thetac,radius,lcyl=0.0,xstart=None):
+        '''CONSTRUCTOR - nose radius, cone half angle in degrees, base radius'''
+        self.rnose = float(rnose)
+        self.thetac = float(thetac)
+        tc = math.radians(self.thetac)
+        self.xt = self.rnose*(1.0 - math.sin(tc))
+        self.rt = self.rnose*math.cos(tc)
+        self.tanc = math.tan(tc)
+        length = self.xt + (radius - self.rt)/self.tanc
+        if xstart is None:
+            # well down the cone, clear of the blunt nose
+            xstart = self.xt + 0.25*(length - self.xt)
+        AnalyticBody.__init__(self,length,radius,lcyl,xstart,
+                              rnose=self.rnose,thetac=self.thetac)
+
+    def nose(self,x):
+        '''Return radius, slope and curvature over the nose'''
+        rn = self.rnose
+        sphere = x < self.xt
+        rs = np.sqrt(x*(2.0*rn - x))
+        r = np.where(sphere,rs,self.rt + (x - self.xt)*self.tanc)
+        rx = np.where(sphere,(rn - x)/rs,self.tanc)
+        rxx = np.where(sphere,-rn*rn/rs**3,0.0)
+        return r, rx, rxx
+
+class TangentOgive(AnalyticBody):
+    '''Tangent ogive, tangent to the cylinder at its base'''
+
+    family = 'ogive'
+
+    def __init__(self,length,radius,lcyl=0.0,xstart=None):
+        '''CONSTRUCTOR - tangent ogive of given length and base radius'''
+        AnalyticBody.__init__(self,length,radius,lcyl,xstart)
+        self.rho = (self.radius**2 + self.length**2)/(2.0*self.radius)
+
+    def nose(self,x):
+        '''Return radius, slope and curvature over the nose'''
+        rho = self.rho
+        d = self.length - x
+        q = np.sqrt(rho*rho - d*d)
+        return q + self.radius - rho, d/q, -rho*rho/q**3
+
+CATALOG = {
+    'haack':        HaackBody,
+    'powerlaw':     PowerLawBody,
+    'spherecone':   SphereCone,
+    'ogive':        TangentOgive,
+}
+
+def makeBody(family,**params):
+    '''Return a catalog body by family name'''
+    if family not in CATALOG:
+        raise ValueError("unknown body family %r (have %s)" % \
+            (family,', '.join(sorted(CATALOG))))
+    return CATALOG[family](**params)
+
+if __name__ == "__main__":
+
+    # check each family's slope and curvature against differences
+    bodies = [HaackBody(20.0,4.0), HaackBody(20.0,4.0,C=1.0/3.0,lcyl=10.0),
+              PowerLawBody(20.0,4.0,0.6), SphereCone(1.0,15.0,4.0,lcyl=5.0),
+              TangentOgive(20.0,4.0,lcyl=10.0)]
+    for body in bodies:
+        x = np.linspace(body.xstart,0.98*body.length,9)
+        h = 1.0e-5*body.length
+        r, rx, rxx = body.getGeometry(x)
+        rp = body.getGeometry(x+h)[0]
+        rm = body.getGeometry(x-h)[0]
+        print("%-18s length %8.4f start %8.4f  slope err %9.2e  curve err %9.2e" % \
+            (body.name,body.bodylength,body.xstart,
+             np.max(np.abs((rp-rm)/(2.0*h) - rx)),
+             np.max(np.abs((rp-2.0*r+rm)/(h*h) - rxx))))
@@ -7,6 +7,9 @@
 #--------------------------------------------------------------------
 
 import math
+import numpy as np
+from PiecewisePoly import PiecewisePoly
+
 
 class PolyBody:
     '''Class to manage polynomial body segments'''
@@ -15,91 +18,87 @@ class PolyBody:
         '''CONSTRUCTOR - create polynomial for body segment'''
         self.x0 = x0
         self.x1 = x1
-        self.coef = []
+        self.coef = list(poly)
         self.degree = len(poly)
-        for c in poly:
-            self.coef.append(c)
-       
+        self.poly = PiecewisePoly([x0,x1],[self.coef])
+
     def getSegRadius(self,x):
         '''Return the radius for a given x'''
-        xbar = (x-self.x0)/(self.x1-self.x0)
-        if (xbar < 0)or(xbar>1.0):
-            rad = -1.0
-        else:
-            # figure the polynomial
-            rad = self.coef[0]
-            for i in range(0,self.degree-1):
-                rad = rad*xbar+self.coef[i+1]
-        return rad
+        return self.poly.evaluate(x)[0]
 
     def getSegSlope(self,x):
         '''Return the slope for a given x'''
-        xbar = (x - self.x0)/(self.x1 - self.x0)
-        if(xbar <0)or(xbar>1.0):
-            slope = 1.0
-            return slope
-        else:
-            factor = float(self.degree -1)
-            slope = factor*self.coef[0]
-            for i in range(0,self.degree-2):
-                 factor = factor-1.0
-                 slope = slope*xbar+factor*self.coef[i+1]
-        slope = slope / (self.x1-self.x0)
-        return slope
+        return self.poly.evaluate(x)[1]
     
     def getSegCurvature(self,x):
         '''Return the curvature for a given x'''
-        xbar = (x - self.x0)/(self.x1 - self.x0)
-        if(xbar <0)or(xbar>1.0):
-            curve = 1.5
-            return curve
-        else:
-            d1 = self.degree-2
-            d2 = self.degree-1
-            factor = float(d1*d2)
-            curve = factor*(self.coef[0])
-            for i in range(0,self.degree-3):
-                d1 = d1-1
-                d2 = d2-1
-                factor = float(d1*d2)
-                curve = curve*xbar+factor*self.coef[i+1]
-            curve = curve / (self.x1 - self.x0)**2
-        return curve
+        return self.poly.evaluate(x)[2]
     
 class Body:
     '''Class to manage body definition'''
-    def __init__(self,segments):
-        '''CONSTRUCTOR - initialize segment array for this body'''
+    def __init__(self,segments,poly=None):
+        '''CONSTRUCTOR - initialize segment array for this body
+
+        A body fitted elsewhere can pass its PiecewisePoly as poly, with
+        no segments.
+        '''
         self.segments = segments
+        if poly is None:
+            poly = PiecewisePoly([seg.x0 for seg in segments] +
+                                 [segments[-1].x1],
+                                 [seg.coef for seg in segments])
+        self.poly = poly
+
+    def evaluate(self,x):
+        '''Return radius, slope and curvature for any given x'''
+        return self.poly.evaluate(x)
+
+    def getGeometry(self,x):
+        '''Return radius, slope and curvature arrays for an array of x
+
+        Points off the body come back as NaN.
+        '''
+        return self.poly.getGeometry(x)
 
     def getRadius(self,x):
         '''Return radius for any given x on a segmented body'''
-        nseg = len(self.segments)
-        for seg in range (0,nseg):
-            rad= self.segments[seg].getSegRadius(x)
-            if rad > 0.0:
-                break
-        return rad
+        return self.poly.evaluate(x)[0]
 
     def getSlope(self,x):
         '''Return slope for any given x on a segmented body'''
-        nseg = len(self.segments)
-        for seg in range (0,nseg):
-            slope= self.segments[seg].getSegSlope(x)
-            if slope < 1.0:
-                break
-        return slope
+        return self.poly.evaluate(x)[1]
     
     def getCurvature(self,x):
         '''Return curvature for any given x on a segmented body'''
-        nseg=len(self.segments)
-        for seg in range(0,nseg):
-            curve = self.segments[seg].getSegCurvature(x)
-            if (curve < 1.0):
-                break
-        return curve
+        return self.poly.evaluate(x)[2]
         
-class OgiveCylinder:
+class BodyShape:
+    '''Plot helpers shared by the body shapes and outer boundaries
+
+    A body shape has a Body in self.body, its length in self.bodylength
+    and a name, and may give the tangent cone station as xstart.
+    '''
+
+    def getBodyPoints(self,num,dx,scale):
+        return self.getPlotPoints(0,num,dx,scale)
+
+    def getBodySlopes(self,num,dx,scale):
+        return self.getPlotPoints(1,num,dx,scale)
+
+    def getBodyCurvatures(self,num,dx,scale):
+        return self.getPlotPoints(2,num,dx,scale)
+
+    def getPlotPoints(self,which,num,dx,scale):
+        '''Return num plot points of radius, slope or curvature
+
+        The values are taken every dx from x = 0 and plotted one dx
+        further along, in units of dx.
+        '''
+        x = dx*np.arange(num)
+        y = self.body.getGeometry(x)[which]*scale
+        return [[i+1.0,float(y[i]/dx)] for i in range(num)]
+    
+class OgiveCylinder(BodyShape):
     '''Test Body for CFDexplorer'''
 
     def __init__(self):
@@ -147,36 +146,9 @@ class OgiveCylinder:
         segments.append(PolyBody(x1,x2,[xh]))
         self.body = Body(segments)
         self.bodylength = x2
+        self.xstart = x0
         self.name = 'Ogive-Cylinder'
         
-    def getBodyPoints(self,num,dx,scale):
-        points = [];
-        x = 0
-        for i in range(num):
-           y = self.body.getRadius(x)*scale
-           x = x + dx
-           points.append([x/dx,y/dx])
-        return points
-
-    def getBodySlopes(self,num,dx,scale):
-        slopes=[]
-        x = 0
-        for i in range(num):
-           y = self.body.getSlope(x)*scale
-           x = x + dx
-           slopes.append([x/dx,y/dx])
-
-        return slopes
-
-    def getBodyCurvatures(self,num,dx,scale):
-        curves = []
-        x = 0
-        for i in range(num):
-           y = self.body.getCurvature(x)*scale
-           x = x + dx
-           curves.append([x/dx,y/dx])
-        return curves
-    
 if __name__ == "__main__":
     
     mybody = OgiveCylinder()
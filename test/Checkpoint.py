@@ -0,0 +1,140 @@
+#--------------------------------------------------------------------
+# File:     Checkpoint.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Checkpoint and restart
+#   A long march with a small dxi can be stopped and picked up again
+#   later. With values['checkpoint'] naming a file, the solver saves
+#   its state there every 'checkpointsteps' steps (100; 0 for none) and
+#   whenever 'checkpointseconds' have passed since the last save (not
+#   set: no timed saves). Tangent cone sweeps count as steps.
+#
+#   The file is a numpy .npz archive holding the flow field block and
+#   every value the next step reads: the station data, dxi, beta, the
+#   march and betloc flags, the print station, the station table of a
+#   fixed step march, a fitted shock, and the step controller and
+#   accelerator counters. It is written under a temporary name and then
+#   renamed, so a job killed while saving leaves the last checkpoint
+#   whole.
+#
+#   AXIsolver.resume loads a checkpoint into a solver built for the
+#   same case, with its body and outer boundary set, and carries on
+#   from the saved step. The resumed run takes the same steps with the
+#   same numbers as one that was never stopped. Debug traces are not
+#   saved; a resumed run starts a new trace file.
+
+import time
+import numpy as np
+from Files import savez
+from Stations import StationTable
+from OuterBoundary import ShockFit
+
+# solver values saved as they are
+SCALARS = ('dxi','beta','march','convrg','betloc','delm','xplot',
+           'xmu1','xmu2','plotx1','plotx2','warm')
+
+# station lists, indexed like the original code
+LISTS = ('x','rb','rbx','rs','rsx')
+
+# station table columns
+TABLE = ('x','dxi','rb','rbx','rs','rsx')
+
+class Checkpointer:
+    '''Save the solver state every few steps or seconds'''
+
+    def __init__(self,values):
+        '''CONSTRUCTOR - read the checkpoint settings'''
+        self.filename = values['checkpoint']
+        self.steps = values.get('checkpointsteps',100)
+        self.seconds = values.get('checkpointseconds')
+        self.last = time.monotonic()
+        self.nsaved = 0
+
+    def step(self,solver,mit):
+        '''Save a checkpoint if one is due after step mit'''
+        due = self.steps > 0 and mit % self.steps == 0
+        if self.seconds is not None and \
+                time.monotonic() - self.last >= self.seconds:
+            due = True
+        if due:
+            save(solver,mit,self.filename)
+            self.last = time.monotonic()
+            self.nsaved += 1
+
+def save(solver,mit,filename):
+    '''Write the solver state after step mit to a checkpoint file'''
+    data = {'mit': mit, 'state': solver.state}
+    for name in SCALARS:
+        data[name] = getattr(solver,name)
+    for name in LISTS:
+        data[name] = np.array(getattr(solver,name))
+    table = solver.stations
+    if table is not None:
+        for name in TABLE:
+            data['table_' + name] = np.array(getattr(table,name),dtype=float)
+        data['table_shock'] = table.rs[0] is not None
+    if isinstance(solver.shock,ShockFit):
+        data['shock_xs'] = np.array(solver.shock.xs)
+        data['shock_rs'] = np.array(solver.shock.rs)
+        data['shock_slopes'] = np.array(solver.shock.slopes)
+    control = solver.control
+    if control is not None:
+        data['control'] = np.array([control.naccept,control.nreject])
+        data['control_err'] = control.err
+    accel = solver.accel
+    if accel is not None:
+        data['accel'] = np.array([accel.nsweep,accel.nextrap,accel.nreject])
+        data['accel_diffs'] = np.array(accel.diffs)
+        if accel.saved is not None:
+            data['accel_state'] = accel.saved[0]
+            data['accel_saved'] = np.array(accel.saved[1:],dtype=float)
+    savez(filename,**data)
+
+def restore(solver,filename):
+    '''Load a checkpoint file into the solver and return its step count
+
+    The solver must be set up for the same case: a checkpoint from
+    another grid raises ValueError.
+    '''
+    with np.load(filename) as data:
+        if data['state'].shape != solver.state.shape or \
+                not np.array_equal(data['state'][0],solver.eta):
+            raise ValueError("%s: checkpoint is for another eta grid" % \
+                filename)
+        solver.state[:] = data['state']
+        for name in SCALARS:
+            setattr(solver,name,data[name].item())
+        for name in LISTS:
+            getattr(solver,name)[:] = data[name].tolist()
+        solver.stations = None
+        if 'table_x' in data:
+            # put the table back as it was built, rather than building
+            # it again from the current station
+            table = StationTable.__new__(StationTable)
+            for name in TABLE:
+                setattr(table,name,data['table_' + name].tolist())
+            if not data['table_shock'].item():
+                table.rs = table.rsx = [None]*len(table.x)
+            table.index = dict([(xk, k) for k, xk in enumerate(table.x)])
+            solver.stations = table
+        if 'shock_xs' in data:
+            solver.shock.xs = data['shock_xs'].tolist()
+            solver.shock.rs = data['shock_rs'].tolist()
+            solver.shock.slopes = data['shock_slopes'].tolist()
+        if 'control' in data and solver.control is not None:
+            solver.control.naccept, solver.control.nreject = \
+                data['control'].tolist()
+            solver.control.err = data['control_err'].item()
+        if 'accel' in data and solver.accel is not None:
+            accel = solver.accel
+            accel.nsweep, accel.nextrap, accel.nreject = data['accel'].tolist()
+            accel.diffs = list(data['accel_diffs'])
+            accel.saved = None
+            if 'accel_state' in data:
+                betloc, delm, dnorm = data['accel_saved'].tolist()
+                accel.saved = (data['accel_state'].copy(),bool(betloc),
+                               delm,dnorm)
+        return int(data['mit'])
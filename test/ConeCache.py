@@ -0,0 +1,180 @@
+#--------------------------------------------------------------------
+# File:     ConeCache.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Tangent cone solution cache
+#   The tangent cone iteration at the starting station depends only on
+#   the free stream, the grid and the geometry at that station, so its
+#   converged column can be kept and used again. With
+#   values['conecache'] set to 'on', converged columns are kept in the
+#   cones cache directory (see Files), one .npz file per
+#   case. The file name is a hash of everything the iteration depends
+#   on: minf, thetas, muinf, the eta grid, dxi, the scheme (implicit or
+#   explicit), and the body and outer boundary radius and slope at the
+#   two starting station levels.
+#
+#   On a hit the column is loaded and the solver goes straight to
+#   marching. Otherwise the nearest entry on the same grid, if it is
+#   close enough, is the starting guess for the iteration, with its
+#   pressures scaled to the new free stream pressure. Nearness is the
+#   largest relative difference in minf, thetas, muinf and the starting
+#   radii and slopes; 'conecachenear' (0.1) is the farthest an entry
+#   can be and still be used.
+#
+#   The cache is held to 'conecachesize' bytes (16 MB) by removing the
+#   least recently used entries. Using an entry touches its file.
+
+import hashlib
+import os
+import numpy as np
+from Files import cacheDir, savez
+
+# bump when the entries change, so old ones are not used
+CACHEVERSION = 1
+
+# flow field rows kept for a column
+ROWS = ('rho','u','v','p')
+
+# station lists kept for a column
+LISTS = ('x','rb','rbx','rs','rsx')
+
+def startGeometry(solver):
+    '''Return x, rb, rbx, rs, rsx at both starting station levels'''
+    geom = []
+    for x in solver.startStations():
+        geom += [x] + list(solver.bodyGeometry(x)) + \
+            list(solver.shockGeometry(x))
+    return geom
+
+class ConeCache:
+    '''Converged tangent cone columns kept on disk'''
+
+    def __init__(self,values):
+        '''CONSTRUCTOR - read the cache settings'''
+        self.dir = cacheDir('cones')
+        self.near = values.get('conecachenear',0.1)
+        self.size = values.get('conecachesize',16*2**20)
+
+    def describe(self,solver):
+        '''Return the grid layout, key and nearness features of a case'''
+        v = solver.values
+        scheme = 'explicit'
+        if not solver.engine.explicit:
+            scheme = 'implicit'
+        gridbeta = 0.0
+        if solver.grid == 'roberts':
+            gridbeta = float(solver.gridbeta)
+        layout = repr((solver.neta,solver.grid,gridbeta,scheme,
+                       np.dtype(solver.dtype).name))
+        geom = startGeometry(solver)
+        text = repr((CACHEVERSION,layout,float(v['minf']),float(v['thetas']),
+                     float(v['muinf']),float(solver.dxi),geom))
+        key = hashlib.sha256(text.encode()).hexdigest()
+        features = np.array([v['minf'],v['thetas'],v['muinf']] + geom[6:],
+                            dtype=float)
+        return layout, key, features
+
+    def path(self,key):
+        '''Return the file for a cache key'''
+        return os.path.join(self.dir,key + '.npz')
+
+    def load(self,solver):
+        '''Load the cached column for the solver's case
+
+        Returns the sweeps the iteration took, or None if the case is
+        not in the cache.
+        '''
+        layout, key, features = self.describe(solver)
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                for k, name in enumerate(ROWS):
+                    getattr(solver,name)[:] = data['rows'][k]
+                for name in LISTS:
+                    getattr(solver,name)[:] = data[name].tolist()
+                solver.betloc = bool(data['betloc'])
+                solver.delm = data['delm'].item()
+                mit = int(data['mit'])
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            return None
+        return mit
+
+    def warmStart(self,solver):
+        '''Start the solver from the nearest cached column
+
+        Returns how far the entry used is from the case, or None if no
+        entry is near enough.
+        '''
+        layout, key, features = self.describe(solver)
+        best = None
+        for name in os.listdir(self.dir):
+            if not name.endswith('.npz'):
+                continue
+            path = os.path.join(self.dir,name)
+            try:
+                with np.load(path) as data:
+                    if str(data['layout']) != layout:
+                        continue
+                    f = data['features']
+            except (OSError, KeyError, ValueError):
+                continue
+            scale = np.maximum(np.maximum(np.abs(f),np.abs(features)),1.0e-12)
+            dist = float(np.max(np.abs(f - features)/scale))
+            if dist <= self.near and (best is None or dist < best[0]):
+                best = (dist,path)
+        if best is None:
+            return None
+        try:
+            with np.load(best[1]) as data:
+                rows = data['rows'].copy()
+                pinf = data['pinf'].item()
+            os.utime(best[1])
+        except (OSError, KeyError, ValueError):
+            return None
+        rows[ROWS.index('p')] *= solver.pinf/pinf
+        for k, name in enumerate(ROWS):
+            getattr(solver,name)[:] = rows[k]
+        return best[0]
+
+    def store(self,solver,mit):
+        '''Keep the solver's converged column, taken in mit sweeps'''
+        layout, key, features = self.describe(solver)
+        data = {'layout': layout, 'features': features, 'mit': mit,
+                'rows': np.array([getattr(solver,name) for name in ROWS]),
+                'betloc': solver.betloc, 'delm': solver.delm,
+                'pinf': solver.pinf}
+        for name in LISTS:
+            data[name] = np.array(getattr(solver,name))
+        path = self.path(key)
+        savez(path,**data)
+        self.evict(path)
+
+    def evict(self,keep):
+        '''Remove least recently used entries until the cache fits'''
+        entries = []
+        for name in os.listdir(self.dir):
+            path = os.path.join(self.dir,name)
+            if not name.endswith('.npz') or path == keep:
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime,st.st_size,path))
+        try:
+            total = os.stat(keep).st_size
+        except OSError:
+            total = 0
+        total += sum([e[1] for e in entries])
+        for mtime, size, path in sorted(entries):
+            if total <= self.size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
@@ -0,0 +1,122 @@
+#--------------------------------------------------------------------
+# File:     Engines.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Station update engines
+#   An engine advances the flow field one marching step. Engines are
+#   registered by name, each with what it can do:
+#
+#       batch       advance (cases x neta) arrays, for BatchSolver
+#       stretched   work on a stretched eta grid
+#       float32     work on a single precision flow field
+#
+#   and how the adaptive step controller can size its steps:
+#
+#       explicit    the step is held to the explicit stability limit
+#       predictor   ppred gets predicted pressures, for the error estimate
+#       dximin      smallest step the scheme tolerates
+#
+#   A run names its engine in values['engine'], or in $RRBAXI_ENGINE
+#   when the values do not name one, so each host can pick its fastest
+#   engine without editing run scripts. 'auto' takes the fastest engine
+#   that fits the run. An engine that is not available on this host
+#   (the Fortran one before make lib), or cannot do what the run needs,
+#   falls back to the first engine in FALLBACK that can. The explicit
+#   engines agree to roundoff; the implicit one uses a different scheme,
+#   so it is only ever run when asked for by name.
+
+import os
+import MacCormack
+import Implicit
+import FortranKernel
+
+class Engine:
+    '''Station update kernel and what it can do'''
+
+    def __init__(self,name,kernel,batch=False,stretched=False,
+                 float32=False,explicit=True,predictor=True,dximin=0.0,
+                 available=None):
+        '''CONSTRUCTOR - kernel takes the MacCormack.precor arguments
+
+        A kernel of None runs the solver's own point by point precor.
+        available, if given, is called to see if the engine can run on
+        this host.
+        '''
+        self.name = name
+        self.kernel = kernel
+        self.batch = batch
+        self.stretched = stretched
+        self.float32 = float32
+        self.explicit = explicit
+        self.predictor = predictor
+        self.dximin = dximin
+        self.check = available
+
+    def available(self):
+        '''Return True if the engine can run on this host'''
+        return self.check is None or bool(self.check())
+
+    def fits(self,batch=False,stretched=False,float32=False):
+        '''Return True if the engine can do everything a run needs'''
+        return (self.batch or not batch) and \
+            (self.stretched or not stretched) and \
+            (self.float32 or not float32)
+
+    def advance(self,solver):
+        '''Take one step of an AXIsolver'''
+        if self.kernel is None:
+            solver.precor()
+        else:
+            solver.precorColumn(self.kernel)
+
+ENGINES = {}
+
+# fastest first: the order 'auto' and fallback search in
+FALLBACK = ['fortran','numpy','scalar']
+
+def register(engine):
+    '''Add an engine to the registry, replacing any of the same name'''
+    ENGINES[engine.name] = engine
+
+register(Engine('scalar',None,stretched=True,float32=True))
+register(Engine('numpy',MacCormack.precor,batch=True,stretched=True,
+                float32=True))
+register(Engine('implicit',Implicit.step,batch=True,stretched=True,
+                explicit=False,predictor=False,dximin=Implicit.DXIMIN))
+register(Engine('fortran',FortranKernel.precor,
+                available=FortranKernel.available))
+
+def requested(values):
+    '''Return the engine name a run asks for'''
+    return values.get('engine',os.environ.get('RRBAXI_ENGINE','scalar'))
+
+def select(values,**needs):
+    '''Return the engine for a run
+
+    needs are the capabilities the run must have, as keywords of
+    Engine.fits. A fallback is reported when the engine was named by
+    the values or the environment.
+    '''
+    name = requested(values)
+    why = None
+    if name != 'auto':
+        if name not in ENGINES:
+            raise ValueError("unknown engine %r (have %s)" % \
+                (name,', '.join(sorted(ENGINES))))
+        engine = ENGINES[name]
+        if not engine.available():
+            why = 'is not available'
+        elif not engine.fits(**needs):
+            why = 'cannot run this case'
+        else:
+            return engine
+    for other in FALLBACK:
+        engine = ENGINES[other]
+        if engine.available() and engine.fits(**needs):
+            if why and ('engine' in values or 'RRBAXI_ENGINE' in os.environ):
+                print("Engine %s %s, using %s" % (name,why,other))
+            return engine
+    raise ValueError("no engine can run this case")
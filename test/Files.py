@@ -0,0 +1,34 @@
+#--------------------------------------------------------------------
+# File:     Files.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Files the solvers keep
+#   Spline fits, tangent cone columns, checkpoints and sweep results
+#   are all numpy .npz archives. savez writes one under a temporary
+#   name and renames it into place, so a reader, or a job killed while
+#   writing, never sees half a file; the name carries the process id,
+#   so workers writing the same entry do not collide.
+#
+#   Cache entries live in $RRBAXI_CACHE, or ~/.cache/rrbaxi if that is
+#   not set, one directory for each kind of entry.
+
+import os
+import numpy as np
+
+def cacheDir(sub):
+    '''Return the cache directory for one kind of entry, creating it'''
+    root = os.environ.get('RRBAXI_CACHE',
+                          os.path.join(os.path.expanduser('~'),'.cache','rrbaxi'))
+    path = os.path.join(root,sub)
+    os.makedirs(path,exist_ok=True)
+    return path
+
+def savez(path,**arrays):
+    '''Write arrays to a .npz archive at path, all at once'''
+    tmp = path + '.%d.tmp' % os.getpid()
+    with open(tmp,'wb') as f:
+        np.savez(f,**arrays)
+    os.replace(tmp,path)
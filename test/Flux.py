@@ -0,0 +1,58 @@
+#--------------------------------------------------------------------
+# File:     Flux.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Flux vectors for the parabolized equations
+#   The predictor and the corrector both need the E and F flux vectors,
+#   the viscous stresses behind them and the H source term along a run
+#   of grid points. This evaluates all of them in one pass so the two
+#   steps share a single copy of the formulas.
+
+import numpy as np
+
+def stresses(v,ueta,veta,r,etax,etar,xmu,beta):
+    '''Return the velocity divergence and the txx, sigxr, trr stresses
+
+    As in the original code, the first point of the run uses v/r in the
+    velocity divergence.
+    '''
+    vr = v*r
+    vr[...,0:1] = v[...,0:1]/r[...,0:1]
+    deldv = etax*ueta + etar*veta + vr
+    tdv = 2.0/3.0*xmu*beta*deldv
+    txx = 2.0*xmu*etax*ueta - tdv
+    sigxr = xmu*(etax*veta + etar*ueta)
+    trr = 2.0*xmu*etar*veta - tdv
+    return deldv, txx, sigxr, trr
+
+def fluxes(rho,u,v,p,ueta,veta,r,etax,etar,xmu,beta):
+    '''Evaluate E, F and H for a run of grid points
+
+    The velocity derivatives are supplied by the caller, so the same code
+    serves the backward differences of the predictor and the forward
+    differences of the corrector; the stresses come from stresses().
+    Returns E, F, the radial component of H and the inviscid part of E.
+    E, F and the inviscid E are stacked component first.
+    '''
+    deldv, txx, sigxr, trr = stresses(v,ueta,veta,r,etax,etar,xmu,beta)
+    tdv = 2.0/3.0*xmu*beta*deldv
+
+    shape = (3,) + np.shape(deldv)
+    e = np.empty(shape)
+    f = np.empty(shape)
+    einv = np.empty(shape)
+    pr = p*r
+    einv[0] = rho*u*r
+    einv[1] = einv[0]*u + pr
+    einv[2] = einv[0]*v
+    e[0] = einv[0]
+    e[1] = einv[1] - txx*r
+    e[2] = einv[2] - sigxr*r
+    f[0] = rho*v*r
+    f[1] = f[0]*u - sigxr*r
+    f[2] = f[0]*v + pr - trr*r
+    h3 = p - 2.0*xmu*v/r + tdv
+    return e, f, h3, einv
@@ -0,0 +1,87 @@
+#--------------------------------------------------------------------
+# File:     FortranKernel.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Compiled Fortran station update
+#   make lib builds the Fortran routines in src/ as librrbaxi.so, with
+#   rrstep (src/bridge.f) as a C callable entry point. rrstep points the
+#   Fortran state arrays at the solver's own numpy rows and runs precor
+#   on them, so the column is updated in place with nothing copied in
+#   or out.
+#
+#   precor here takes the same arguments as MacCormack.precor, so
+#   AXIsolver.precorColumn can run it, one case at a time. The Fortran
+#   precor works on a uniform eta grid and writes no trace records. The
+#   predicted pressures come back through rrstep into ppred, for the
+#   step size controller.
+#
+#   The library is looked for at $RRBAXI_LIB, then in the top of the
+#   repository.
+
+import ctypes
+import os
+import numpy as np
+
+LIBNAME = 'librrbaxi.so'
+
+_lib = None
+
+def libPath():
+    '''Return where the shared library should be'''
+    path = os.environ.get('RRBAXI_LIB')
+    if path:
+        return path
+    top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(top,LIBNAME)
+
+def load():
+    '''Return the loaded library, loading it the first time
+
+    Raises OSError if the library has not been built.
+    '''
+    global _lib
+    if _lib is None:
+        lib = ctypes.CDLL(libPath())
+        column = np.ctypeslib.ndpointer(dtype=np.float64,ndim=1,
+                                        flags='C_CONTIGUOUS')
+        lib.rrstep.argtypes = [ctypes.c_int] + [column]*7 + \
+            [ctypes.c_double]*6 + \
+            [ctypes.POINTER(ctypes.c_int),ctypes.POINTER(ctypes.c_double)]
+        lib.rrstep.restype = None
+        _lib = lib
+    return _lib
+
+def available():
+    '''Return True if the library can be loaded'''
+    try:
+        load()
+    except OSError:
+        return False
+    return True
+
+def precor(eta,rho,u,v,p,m1,m2,dxi,xmu,beta,hinf,pinf,deni,betloc,
+           trace=None,ppred=None):
+    '''Advance the column one step with the Fortran precor
+
+    Returns the largest pressure increase and the betloc flag, as
+    MacCormack.precor does.
+    '''
+    lib = load()
+    if np.ndim(rho) != 1:
+        raise ValueError("the Fortran kernel runs one case at a time")
+    if np.ptp(deni[1:]) != 0.0:
+        raise ValueError("the Fortran kernel needs a uniform eta grid")
+    if ppred is None:
+        ppred = np.empty_like(p)
+    geom = np.array(m1.key + m2.key,dtype=np.float64)
+    lock = ctypes.c_int(int(bool(betloc)))
+    delm = ctypes.c_double(0.0)
+    # index 0 is the solver's unused point, so the Fortran point 1 is
+    # element 1 of each row
+    lib.rrstep(len(rho)-1,rho[1:],u[1:],v[1:],p[1:],eta[1:],ppred[1:],geom,
+               dxi,xmu,beta,hinf,pinf,float(deni[1]),
+               ctypes.byref(lock),ctypes.byref(delm))
+    return delm.value, bool(lock.value)
@@ -0,0 +1,176 @@
+#--------------------------------------------------------------------
+# File:     MacCormack.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Whole-column MacCormack predictor corrector
+#   The scalar AXIsolver.precor walks the eta column one point at a
+#   time. Every predictor value it needs comes from the old (level 1)
+#   data, and every corrector value from the finished predictor pass,
+#   so both passes can be done as array operations over the column.
+#
+#   Arrays use the same layout as the solver lists: index 0 is unused,
+#   index 1 is the wall and index neta is the outer boundary. Leading
+#   axes are cases: per-case parameters are passed with a trailing axis
+#   of length 1 and the betloc flags with none.
+#
+#   deni holds the inverse eta spacing in the same layout, deni[i] =
+#   1/(eta[i] - eta[i-1]), so the differences work on stretched grids.
+
+import numpy as np
+import Flux
+import Trace
+
+PHM = 1.4/2.4
+PHS = 0.95*PHM
+
+def solve(i,aa,bb,cc,hinf,betloc):
+    '''Reduce solution vectors to primitive values
+
+    Array version of AXIsolver.solve. The points are taken to be decoded
+    in order along the last axis, so once phi passes the lock limit the
+    wall point (i == 2) is locked for that point and every one after it.
+    Returns rr, uu, vv, pp and the betloc flag as it stands after each
+    point.
+    '''
+    xk = hinf - 0.5*(cc/aa)**2
+    phi = 0.8 * xk * aa * aa/(1.4 * bb * bb)
+    lock = np.logical_or.accumulate(phi > PHS,axis=-1) \
+        | np.expand_dims(betloc,-1)
+    phi = np.where((i == 2) & lock, PHM, phi)
+    rad = np.where(phi < PHM, np.sqrt(np.maximum(1.0-phi-phi/1.4, 0.0)), 0.0)
+    den = 1.4*phi - 0.4
+    xmx = (1.0 - phi + rad)/den
+    pp = bb /(1.0 + 1.4*xmx)
+    t = xk/(1.0 + 0.2*xmx)
+    rr = 1.4*pp/(0.4*t)
+    return rr, aa/rr, cc/aa, pp, lock
+
+def _traceSweep(trace,i,pred,spred,scorr,detail=None):
+    '''Emit point records in the order the scalar sweep writes them
+
+    detail, for a DETAIL trace, holds the wall, wallstr, wallE and wallF
+    values at the first point and the level 1 E fluxes at points 2 -
+    neta.
+    '''
+    for k in range(len(i)+1):
+        if k < len(i) and trace.want(i[k]):
+            if detail is not None and k == 0:
+                for tag, val in zip(('wall','wallstr','wallE','wallF'),
+                                    detail[:4]):
+                    trace.emit(tag,int(i[k]),*[float(x) for x in val])
+            trace.emit('pred',int(i[k]),*[float(val[k]) for val in pred])
+            if detail is not None:
+                for tag, val in zip(('e1x','e2x','e3x'),detail[4]):
+                    trace.emit(tag,int(i[k]),float(val[k]),float(val[k+1]))
+            trace.emit('solve',int(i[k]),*[float(val[k]) for val in spred])
+        if k > 0 and trace.want(i[k-1]):
+            trace.emit('solve',int(i[k-1]),*[float(val[k-1]) for val in scorr])
+
+def precor(eta,rho,u,v,p,m1,m2,dxi,xmu,beta,hinf,pinf,deni,betloc,
+           trace=None,ppred=None):
+    '''Advance the column one marching step
+
+    m1 and m2 are the StationMetrics at x[1] and x[2]. The flow
+    arrays are updated in place for points 1 to neta-1. Returns the
+    largest pressure increase and the new betloc flag. An optional
+    single-case Trace gets the same point and detail records the scalar
+    precor writes, and an optional ppred array gets the predicted
+    pressures.
+    '''
+    n = eta.shape[-1] - 1
+    # inverse spacings between points 1-2 ... n-1-n, and for the
+    # forward and backward differences at points 2 - n-1
+    den1 = deni[...,2:]
+    denf = deni[...,3:]
+    denb = deni[...,2:n]
+    r1, etar1, etax1 = m1.r, m1.etar, m1.etax
+    r2, etar2, etax2 = m2.r, m2.etar, m2.etax
+
+    # level 1 fluxes at points 2 - neta (backward differences)
+    s = slice(2,n+1)
+    ueta = (u[...,2:]-u[...,1:-1])*den1
+    veta = (v[...,2:]-v[...,1:-1])*den1
+    e, f, h3, einv = Flux.fluxes(rho[...,s],u[...,s],v[...,s],p[...,s],
+                                 ueta,veta,r1[...,s],etax1[...,s],etar1,xmu,beta)
+
+    # predictor at points 2 - neta-1 (forward differences)
+    s = slice(2,n)
+    xep = einv[...,:-1]
+    fac = dxi*etax1[...,s]*denf
+    far = dxi*etar1*denf
+    ep = xep - fac*(e[...,1:]-e[...,:-1]) - far*(f[...,1:]-f[...,:-1])
+    ep[2] += dxi*h3[...,:-1]
+    ep1, ep2, ep3 = ep
+
+    i = np.arange(2,n)
+    tpoint = trace is not None and trace.active(Trace.POINT)
+    detail = None
+    if tpoint:
+        pred = (ep1,ep2,ep3)
+        spred = (ep1/r2[...,s],ep2/r2[...,s],ep3/r2[...,s])
+        if trace.active(Trace.DETAIL):
+            stress = Flux.stresses(v[...,2:3],ueta[...,:1],veta[...,:1],
+                                   r1[...,2:3],etax1[...,2:3],etar1,xmu,beta)
+            detail = ((etax1[...,2],deni[...,2],ueta[...,0],veta[...,0]),
+                      [val[...,0] for val in stress],e[...,0],f[...,0],e)
+    wr, wu, wv, wp, lockp = solve(i,ep1/r2[...,s],ep2/r2[...,s],
+                                  ep3/r2[...,s],hinf,betloc)
+
+    if ppred is not None:
+        ppred[...,s] = wp
+
+    # predicted window: wall, field points, free stream
+    shape = rho.shape
+    w = [np.empty(shape), np.empty(shape), np.empty(shape), np.empty(shape)]
+    for k, val in enumerate((wr,wu,wv,wp)):
+        w[k][...,s] = val
+    w[3][...,1:2] = w[3][...,2:3]
+    w[1][...,1:2] = 0.0
+    w[2][...,1:2] = 0.0
+    w[0][...,1:2] = 1.4*w[3][...,1:2]/(0.4*hinf)
+    w[0][...,n:] = 1.0
+    w[1][...,n:] = 1.0
+    w[2][...,n:] = 0.0
+    w[3][...,n:] = pinf
+
+    # predicted fluxes at points 1 - neta-1 (forward differences)
+    s = slice(1,n)
+    ueta = (w[1][...,2:]-w[1][...,1:-1])*den1
+    veta = (w[2][...,2:]-w[2][...,1:-1])*den1
+    e, f, h3, einv = Flux.fluxes(w[0][...,s],w[1][...,s],w[2][...,s],w[3][...,s],
+                                 ueta,veta,r2[...,s],etax2[...,s],etar2,xmu,beta)
+
+    # corrector at points 2 - neta-1 (backward differences), reusing
+    # the level 1 inviscid fluxes from the predictor
+    s = slice(2,n)
+    fac = dxi*etax2[...,s]*denb
+    far = dxi*etar2*denb
+    ep = einv[...,1:] + xep - fac*(e[...,1:]-e[...,:-1]) \
+        - far*(f[...,1:]-f[...,:-1])
+    ep[2] += dxi*h3[...,1:]
+    ep1, ep2, ep3 = 0.5*ep
+
+    if tpoint:
+        _traceSweep(trace,i,pred,spred,
+                    (ep1/r2[...,s],ep2/r2[...,s],ep3/r2[...,s]),detail)
+    # by the time the wall point is corrected the scalar solver has
+    # also decoded the predictor at point 3
+    rr, uu, vv, pp, lockc = solve(i,ep1/r2[...,s],ep2/r2[...,s],
+                                  ep3/r2[...,s],hinf,lockp[...,min(1,n-3)])
+
+    delp = pp - p[...,s]
+    rho[...,s] = rr
+    u[...,s] = uu
+    v[...,s] = vv
+    p[...,s] = pp
+
+    # Body conditions
+    p[...,1:2] = p[...,2:3]
+    rho[...,1:2] = 1.4*p[...,1:2]/(0.4*hinf)
+
+    betloc = lockp[...,-1] | lockc[...,-1]
+    # like the scalar sweep, points that have gone bad are skipped
+    return np.fmax.reduce(delp,axis=-1), betloc
@@ -0,0 +1,42 @@
+#--------------------------------------------------------------------
+# File:     Metrics.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Grid metrics for the eta transformation
+#   eta = (r - rb)/(rs - rb) maps the region between the body and the
+#   outer boundary onto [0,1]. At a marching station the radius and the
+#   metric terms of every grid point depend only on the station geometry
+#   and the fixed eta array, so they are computed once per station.
+
+class StationMetrics:
+    '''Radius and eta metrics for the whole column at one station'''
+
+    def __init__(self,eta,rb,rbx,rs,rsx):
+        '''CONSTRUCTOR - evaluate metrics from the station geometry'''
+        self.key  = (rb,rbx,rs,rsx)
+        self.r    = rb + eta*(rs-rb)
+        self.etar = 1.0/(rs-rb)
+        self.etax = ((eta-1.0)*rbx - eta*rsx)*self.etar
+
+class MetricCache:
+    '''Hold the metrics of the most recent stations'''
+
+    def __init__(self,eta,size=2):
+        '''CONSTRUCTOR - start an empty cache for this eta grid'''
+        self.eta = eta
+        self.size = size
+        self.entries = []
+
+    def getMetrics(self,rb,rbx,rs,rsx):
+        '''Return metrics for a station, reusing a cached entry if we can'''
+        key = (rb,rbx,rs,rsx)
+        for m in self.entries:
+            if m.key == key:
+                return m
+        m = StationMetrics(self.eta,rb,rbx,rs,rsx)
+        self.entries.insert(0,m)
+        del self.entries[self.size:]
+        return m
@@ -6,100 +6,19 @@
 # Course:   CS 5335
 #--------------------------------------------------------------------
 
+from bisect import bisect_right
 import math
+import numpy as np
+from Body import PolyBody, Body, BodyShape
+from PiecewisePoly import OFFCURVE
 
-class OuterBoundary:
-    '''Class to manage outer computational boundary'''
-
-    def __init__(self,x0,x1,poly):
-        '''CONSTRUCTOR - create polynomial for outer boundary'''
-        self.x0 = x0
-        self.x1 = x1
-        self.coef = []
-        self.degree = len(poly)
-        for c in poly:
-            self.coef.append(c)
-       
-    def getSegRadius(self,x):
-        '''Return the radius for a given x'''
-        xbar = (x-self.x0)/(self.x1-self.x0)
-        if (xbar < 0)or(xbar>1.0):
-            rad = -1.0
-        else:
-            # figure the polynomial
-            rad = self.coef[0]
-            for i in range(0,self.degree-1):
-                rad = rad*xbar+self.coef[i+1]
-        return rad
-
-    def getSegSlope(self,x):
-        '''Return the slope for a given x'''
-        xbar = (x - self.x0)/(self.x1 - self.x0)
-        if(xbar <0)or(xbar>1.0):
-            slope = 1.0
-            return slope
-        else:
-            factor = float(self.degree -1)
-            slope = factor*self.coef[0]
-            for i in range(0,self.degree-2):
-                 factor = factor-1.0
-                 slope = slope*xbar+factor*self.coef[i+1]
-        slope = slope / (self.x1-self.x0)
-        return slope
-    
-    def getSegCurvature(self,x):
-        '''Return the curvature for a given x'''
-        xbar = (x - self.x0)/(self.x1 - self.x0)
-        if(xbar <0)or(xbar>1.0):
-            curve = 1.5
-            return curve
-        else:
-            d1 = self.degree-2
-            d2 = self.degree-1
-            factor = float(d1*d2)
-            curve = factor*(self.coef[0])
-            for i in range(0,self.degree-3):
-                d1 = d1-1
-                d2 = d2-1
-                factor = float(d1*d2)
-                curve = curve*xbar+factor*self.coef[i+1]
-            curve = curve / (self.x1 - self.x0)**2
-        return curve
-    
-class Boundary:
-    '''Class to manage outer boundary definition'''
-    def __init__(self,segments):
-        '''CONSTRUCTOR - initialize segment array for this body'''
-        self.segments = segments
+class OuterBoundary(PolyBody):
+    '''Class to manage outer computational boundary segments'''
 
-    def getRadius(self,x):
-        '''Return radius for any given x on a segmented body'''
-        nseg = len(self.segments)
-        for seg in range (0,nseg):
-            rad= self.segments[seg].getSegRadius(x)
-            if rad > 0.0:
-                break
-        return rad
+class Boundary(Body):
+    '''Class to manage outer boundary definition'''
 
-    def getSlope(self,x):
-        '''Return slope for any given x on a segmented body'''
-        nseg = len(self.segments)
-        for seg in range (0,nseg):
-            slope= self.segments[seg].getSegSlope(x)
-            if slope < 1.0:
-                break
-        return slope
-    
-    def getCurvature(self,x):
-        '''Return curvature for any given x on a segmented outer boundary'''
-        nseg=len(self.segments)
-        for seg in range(0,nseg):
-            curve = self.segments[seg].getSegCurvature(x)
-            if (curve < 1.0):
-                break
-        return curve
-        
-class OuterCone:
+class OuterCone(BodyShape):
     '''Test Outer Boundary for CFDexplorer'''
 
     def __init__(self,angle,length):
@@ -117,33 +36,101 @@ class OuterCone:
         self.name = 'Conical Outer Boundary'
         
     def getBoundaryPoints(self,num,dx,scale):
-        points = [];
-        x = 0
-        for i in range(num):
-           y = self.body.getRadius(x)*scale
-           x = x + dx
-           points.append([x/dx,y/dx])
-        return points
+        return self.getPlotPoints(0,num,dx,scale)
 
     def getBoundarySlopes(self,num,dx,scale):
-        slopes=[]
-        x = 0
-        for i in range(num):
-           y = self.body.getSlope(x)*scale
-           x = x + dx
-           slopes.append([x/dx,y/dx])
-
-        return slopes
+        return self.getPlotPoints(1,num,dx,scale)
 
     def getBoundaryCurvatures(self,num,dx,scale):
-        curves = []
-        x = 0
-        for i in range(num):
-           y = self.body.getCurvature(x)*scale
-           x = x + dx
-           curves.append([x/dx,y/dx])
-        return curves
+        return self.getPlotPoints(2,num,dx,scale)
     
+class ShockFit(OuterCone):
+    '''Outer boundary that follows the captured shock
+
+    The boundary starts as the cone of OuterCone for the tangent cone
+    iteration. Once marching, after each step the pressure rise at the
+    outermost field point is taken as a normal shock,
+
+        p/pinf = 1 + 2 gamma/(gamma+1) (Mn^2 - 1),   Mn = minf sin(sigma)
+
+    and the boundary carries on from the new station at the shock angle
+    sigma. With freestream at that point sigma is the Mach angle, so a
+    boundary that runs ahead of the shock turns in until the shock
+    reaches it, and one the shock pushes against turns out. The grid
+    points then stay between the body and the shock.
+    '''
+
+    GAMMA = 1.4
+    SINMAX = 0.99       # keep the boundary short of normal to the flow
+
+    def __init__(self,angle,length,minf):
+        '''Start from a conical outer boundary at angle degrees'''
+        OuterCone.__init__(self,angle,length)
+        self.minf = minf
+        self.slope0 = math.tan(math.radians(angle))
+        self.body = self
+        self.name = 'Shock-fitted Outer Boundary'
+        self.reset()
+
+    def reset(self):
+        '''Go back to the starting cone'''
+        self.xs = [0.0]
+        self.rs = [0.0]
+        self.slopes = [self.slope0]
+
+    def shockSlope(self,pratio):
+        '''Return the shock slope dr/dx for a static pressure ratio'''
+        g = self.GAMMA
+        mn2 = 1.0 + (pratio - 1.0)*(g + 1.0)/(2.0*g)
+        sins = min(math.sqrt(max(mn2,1.0))/self.minf,self.SINMAX)
+        return sins/math.sqrt(1.0 - sins*sins)
+
+    def update(self,solver):
+        '''Turn the boundary at the station the solver just finished'''
+        bl = solver.mybody.bodylength
+        self.turn(solver.x[2]*bl,solver.rs[2]*bl,
+                  solver.p[solver.neta-1]/solver.pinf)
+
+    def turn(self,xb,rb,pratio):
+        '''Turn the boundary at x = xb, where it has radius rb and the
+        outermost field point has pressure ratio pratio'''
+        if xb <= self.xs[-1]:
+            return
+        self.xs.append(xb)
+        self.rs.append(rb)
+        self.slopes.append(self.shockSlope(pratio))
+
+    def evaluate(self,x):
+        '''Return radius, slope and curvature for any given x'''
+        if not (0.0 <= x <= self.bodylength):
+            return OFFCURVE
+        k = bisect_right(self.xs,x) - 1
+        slope = self.slopes[k]
+        return self.rs[k] + slope*(x - self.xs[k]), slope, 0.0
+
+    def getGeometry(self,x):
+        '''Return radius, slope and curvature arrays for an array of x'''
+        x = np.asarray(x,dtype=float)
+        k = np.searchsorted(self.xs,x,side='right') - 1
+        k = np.clip(k,0,len(self.xs)-1)
+        slope = np.array(self.slopes)[k]
+        rad = np.array(self.rs)[k] + slope*(x - np.array(self.xs)[k])
+        off = (x < 0.0) | (x > self.bodylength) | np.isnan(x)
+        return np.where(off,np.nan,rad), np.where(off,np.nan,slope), \
+            np.where(off,np.nan,0.0)
+
+    def getRadius(self,x):
+        '''Return radius for any given x'''
+        return self.evaluate(x)[0]
+
+    def getSlope(self,x):
+        '''Return slope for any given x'''
+        return self.evaluate(x)[1]
+
+    def getCurvature(self,x):
+        '''Return curvature for any given x'''
+        return self.evaluate(x)[2]
+
 if __name__ == "__main__":
     
     thetas = 22.0
@@ -0,0 +1,97 @@
+#--------------------------------------------------------------------
+# File:     PiecewisePoly.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Piecewise polynomial curves
+#   Body and outer boundary contours are made of polynomial segments in
+#   the local coordinate
+#
+#       xbar = (x - x0)/(x1 - x0)
+#
+#   with coefficients highest power first. All segments of a curve are
+#   held in one coefficient array, padded with leading zeros to the
+#   highest degree, so the curve can be evaluated at a whole array of x
+#   at once. The radius and its first two derivatives come from one
+#   Horner pass:
+#
+#       d2 = d2*xbar + 2*d1,  d1 = d1*xbar + p,  p = p*xbar + c
+#
+#   Where two segments meet the first one is used. Segments are taken
+#   to follow each other with no gaps.
+
+from bisect import bisect_left
+import numpy as np
+
+# values returned for an x off the curve by the scalar evaluate
+OFFCURVE = (-1.0, 1.0, 1.5)
+
+def horner(coef,xbar):
+    '''Return p, dp/dxbar and d2p/dxbar2 for coefficient rows at xbar
+
+    coef has one row of coefficients, highest power first, for each
+    point in xbar.
+    '''
+    p = np.zeros(np.shape(xbar))
+    d1 = np.zeros(np.shape(xbar))
+    d2 = np.zeros(np.shape(xbar))
+    for j in range(coef.shape[-1]):
+        d2 = d2*xbar + 2.0*d1
+        d1 = d1*xbar + p
+        p = p*xbar + coef[...,j]
+    return p, d1, d2
+
+class PiecewisePoly:
+    '''Curve made of polynomial segments'''
+
+    __slots__ = ('breaks','width','coef','table')
+
+    def __init__(self,breaks,polys):
+        '''CONSTRUCTOR - segment k runs from breaks[k] to breaks[k+1]'''
+        self.breaks = np.array(breaks,dtype=float)
+        self.width = np.diff(self.breaks)
+        ncoef = max([len(poly) for poly in polys])
+        self.coef = np.zeros((len(polys),ncoef))
+        for k, poly in enumerate(polys):
+            self.coef[k,ncoef-len(poly):] = poly
+        # plain float rows for the scalar evaluate, which is called a
+        # few times per marching step and is faster without numpy
+        self.table = (list(breaks),
+                      [(float(breaks[k]),float(breaks[k+1]-breaks[k]),
+                        tuple([float(c) for c in poly]))
+                       for k, poly in enumerate(polys)])
+
+    def evaluate(self,x):
+        '''Return radius, slope and curvature at one x
+
+        An x off the curve gets the OFFCURVE values.
+        '''
+        xb, segs = self.table
+        if not (xb[0] <= x <= xb[-1]):
+            return OFFCURVE
+        k = max(bisect_left(xb,x) - 1,0)
+        x0, h, coef = segs[k]
+        xbar = (x - x0)/h
+        p = d1 = d2 = 0.0
+        for c in coef:
+            d2 = d2*xbar + 2.0*d1
+            d1 = d1*xbar + p
+            p = p*xbar + c
+        return p, d1/h, d2/(h*h)
+
+    def getGeometry(self,x):
+        '''Return radius, slope and curvature arrays for an array of x
+
+        Each x is placed in its segment with one search of the breaks.
+        Points off the curve come back as NaN.
+        '''
+        x = np.asarray(x,dtype=float)
+        k = np.searchsorted(self.breaks,x) - 1
+        k = np.clip(k,0,len(self.width)-1)
+        h = self.width[k]
+        p, d1, d2 = horner(self.coef[k],(x - self.breaks[k])/h)
+        off = (x < self.breaks[0]) | (x > self.breaks[-1]) | np.isnan(x)
+        return np.where(off,np.nan,p), np.where(off,np.nan,d1/h), \
+            np.where(off,np.nan,d2/(h*h))
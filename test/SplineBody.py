@@ -0,0 +1,161 @@
+#--------------------------------------------------------------------
+# File:     SplineBody.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Body from measured points
+#   Measured and CAD shapes come as a table of (x, r) points, in a CSV
+#   file (two columns, a header line and # comments allowed) or a .npy
+#   array of shape (n,2). A natural cubic spline through the points
+#   gives a body with continuous slope and curvature. The second
+#   derivatives M at the points solve the tridiagonal system
+#
+#       h[k-1] M[k-1] + 2 (h[k-1]+h[k]) M[k] + h[k] M[k+1]
+#           = 6 ((r[k+1]-r[k])/h[k] - (r[k]-r[k-1])/h[k-1])
+#
+#   with M = 0 at both ends. Each interval is then turned into a cubic
+#   in xbar, so the spline is a PiecewisePoly like any other body, with
+#   a binary search per point and the array getGeometry path.
+#
+#   The tangent cone station is the end of the conical tip: the run of
+#   intervals from the first point where the spline has no curvature.
+#   A shape without one must be given its xstart.
+#
+#   The fitted coefficients are kept in the splines cache directory
+#   (see Files), keyed by a hash of the point file, so a shape is only
+#   fitted once.
+
+import hashlib
+import os
+import numpy as np
+from Body import Body, BodyShape
+from Files import cacheDir, savez
+from PiecewisePoly import PiecewisePoly
+
+# bump when the fit changes, so old cache entries are not used
+FITVERSION = 1
+
+def readPoints(filename):
+    '''Return the x and r columns of a point file, sorted on x'''
+    if filename.endswith('.npy'):
+        pts = np.load(filename)
+    else:
+        pts = np.genfromtxt(filename,delimiter=',',comments='#')
+        pts = pts[~np.any(np.isnan(np.atleast_2d(pts)),axis=1)]
+    pts = np.atleast_2d(np.asarray(pts,dtype=float))
+    if pts.ndim != 2 or pts.shape[1] < 2 or pts.shape[0] < 2:
+        raise ValueError("%s: need at least two (x, r) points" % filename)
+    pts = pts[np.argsort(pts[:,0],kind='stable')]
+    x, r = pts[:,0], pts[:,1]
+    if np.any(np.diff(x) <= 0.0):
+        raise ValueError("%s: x values must be distinct" % filename)
+    return x, r
+
+def fitSpline(x,r):
+    '''Return the xbar cubic coefficients of a natural spline, one row
+    per interval'''
+    n = len(x)
+    h = np.diff(x)
+    slope = np.diff(r)/h
+    m = np.zeros(n)
+    if n > 2:
+        # tridiagonal system for M at the interior points, by elimination
+        sub = h[:-1]
+        diag = 2.0*(h[:-1] + h[1:])
+        sup = h[1:]
+        rhs = 6.0*np.diff(slope)
+        for k in range(1,n-2):
+            w = sub[k]/diag[k-1]
+            diag[k] = diag[k] - w*sup[k-1]
+            rhs[k] = rhs[k] - w*rhs[k-1]
+        mi = np.empty(n-2)
+        mi[-1] = rhs[-1]/diag[-1]
+        for k in range(n-4,-1,-1):
+            mi[k] = (rhs[k] - sup[k]*mi[k+1])/diag[k]
+        m[1:-1] = mi
+    b = slope - h*(2.0*m[:-1] + m[1:])/6.0
+    return np.column_stack(((m[1:]-m[:-1])*h*h/6.0, 0.5*m[:-1]*h*h,
+                            b*h, r[:-1]))
+
+def tipEnd(x,coef,tol=1.0e-3):
+    '''Return the x where the straight run of intervals at the tip ends
+
+    An interval is straight if its second derivatives are below tol
+    times the largest on the body. Returns None if the shape has no
+    straight tip, or is straight all the way.
+    '''
+    h = np.diff(x)
+    m = np.append(2.0*coef[:,1]/(h*h),
+                  2.0*(coef[-1,1] + 3.0*coef[-1,0])/(h[-1]*h[-1]))
+    curved = np.abs(m) > tol*np.max(np.abs(m))
+    if not np.any(curved):
+        return None
+    k = int(np.argmax(curved))
+    if k < 2:
+        return None
+    return float(x[k-1])
+
+class SplineBody(BodyShape):
+    '''Body fitted through a file of measured points'''
+
+    def __init__(self,filename,name=None,cache=True,xstart=None):
+        '''CONSTRUCTOR - fit or load the spline for a point file
+
+        xstart is the tangent cone station; if it is not given it is
+        the end of the conical tip.
+        '''
+        with open(filename,'rb') as f:
+            data = f.read()
+        key = hashlib.sha256(data + b'%d' % FITVERSION).hexdigest()
+        coef = None
+        if cache:
+            path = os.path.join(cacheDir('splines'),key + '.npz')
+            if os.path.exists(path):
+                try:
+                    with np.load(path) as saved:
+                        x, coef = saved['x'], saved['coef']
+                except (OSError, KeyError, ValueError):
+                    coef = None
+        if coef is None:
+            x, r = readPoints(filename)
+            coef = fitSpline(x,r)
+            if cache:
+                savez(path,x=x,coef=coef)
+        self.key = key
+        self.body = Body([],PiecewisePoly(x,coef))
+        self.bodylength = float(x[-1])
+        if xstart is None:
+            xstart = tipEnd(x,coef)
+            if xstart is None:
+                raise ValueError("%s: no conical tip to start the solution "
+                                 "on, give xstart" % filename)
+        self.xstart = float(xstart)
+        self.name = name
+        if name is None:
+            self.name = os.path.splitext(os.path.basename(filename))[0]
+
+if __name__ == "__main__":
+
+    # fit the ogive cylinder from a table of its points and compare
+    import sys
+    import tempfile
+    from Body import OgiveCylinder
+    exact = OgiveCylinder()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    x = np.linspace(0.0,exact.bodylength,n)
+    r = exact.body.getGeometry(x)[0]
+    fd, filename = tempfile.mkstemp(suffix='.csv')
+    os.close(fd)
+    np.savetxt(filename,np.column_stack((x,r)),delimiter=',',header='x,r')
+    mybody = SplineBody(filename,cache=False)
+    os.remove(filename)
+    print("Body %s length = %10.6f, %d points, xstart = %10.6f (%10.6f)\n" % \
+        (mybody.name,mybody.bodylength,n,mybody.xstart,exact.xstart))
+    xt = np.linspace(0.5,exact.bodylength-0.5,7)
+    fit = mybody.body.getGeometry(xt)
+    ref = exact.body.getGeometry(xt)
+    for k in range(len(xt)):
+        print("X=%10.6f R=%10.6f (%10.6f) dR/dx=%10.6f (%10.6f)" % \
+            (xt[k],fit[0][k],ref[0][k],fit[1][k],ref[1][k]))
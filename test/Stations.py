@@ -0,0 +1,61 @@
+#--------------------------------------------------------------------
+# File:     Stations.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Marching station table
+#   With fixed step growth the marching stations are known before the
+#   march starts: from the starting station each step adds dxi and then
+#   grows it by 1.005, until x passes 1 - dxi. The table runs the same
+#   recurrence the solver does, so its x values match the solver's to
+#   the last bit, and evaluates the body and outer boundary radius and
+#   slope at every station in one array call.
+#
+#   body() looks each station up by its x. A station that is not in the
+#   table (an adaptive step, or a run whose steps were changed) is
+#   evaluated directly, so the table is only ever a shortcut. An outer
+#   boundary that moves with the solution is always evaluated directly.
+
+class StationTable:
+    '''Station schedule and geometry for a fixed step march'''
+
+    def __init__(self,mybody,shock,x,dxi,growth=1.005):
+        '''CONSTRUCTOR - build the stations from x with first step dxi
+
+        With no shock, only the body geometry is tabled and lookup
+        gives None for rs and rsx.
+        '''
+        self.x = [x]
+        self.dxi = [dxi]
+        while True:
+            x = x + dxi
+            dxi = growth * dxi
+            self.x.append(x)
+            self.dxi.append(dxi)
+            if x > 1.0 - dxi:
+                break
+        bl = mybody.bodylength
+        xb = [xk*bl for xk in self.x]
+        rb, rbx, curve = mybody.body.getGeometry(xb)
+        self.rb  = (rb/bl).tolist()
+        self.rbx = rbx.tolist()
+        if shock is None:
+            self.rs = self.rsx = [None]*len(self.x)
+        else:
+            rs, rsx, curve = shock.body.getGeometry(xb)
+            self.rs  = (rs/bl).tolist()
+            self.rsx = rsx.tolist()
+        self.index = dict([(xk, k) for k, xk in enumerate(self.x)])
+
+    def __len__(self):
+        '''Return the number of stations, counting the starting one'''
+        return len(self.x)
+
+    def lookup(self,x):
+        '''Return rb, rbx, rs, rsx at station x, or None if x is not one'''
+        k = self.index.get(x)
+        if k is None:
+            return None
+        return self.rb[k], self.rbx[k], self.rs[k], self.rsx[k]
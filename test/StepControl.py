@@ -0,0 +1,136 @@
+#--------------------------------------------------------------------
+# File:     StepControl.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Adaptive marching step size control
+#   The original code grows dxi by a fixed 1.005 each marching step.
+#   Here each step is sized from two estimates:
+#
+#   stability - the explicit scheme must not step past the eta spacing
+#       along the fastest characteristic, or past the viscous diffusion
+#       limit, anywhere in the supersonic part of the column. On a
+#       stretched grid the smallest eta spacing is used.
+#   accuracy - the difference between the predicted and corrected
+#       pressure is a local error estimate. Across the captured shock it
+#       grows about linearly with dxi, so steps are scaled as first order.
+#
+#   What applies comes from the engine (see Engines): an engine that
+#   is not explicit has no stability limit, and one with no predictor
+#   (the implicit one) has its steps sized from the pressure change
+#   over the step instead. Steps are kept above the smallest step the
+#   engine tolerates.
+#
+#   A step whose error is over tolerance is thrown away and retried
+#   with a smaller dxi. The product beta*dxi is held fixed, as the
+#   original 1.005 growth did.
+#
+#   Settings come from the solver values:
+#       stepcontrol 'fixed' (default) or 'adaptive'
+#       steptol     rms relative pressure error (0.1, no predictor 0.02)
+#       cfl         fraction of the stability limit       (0.8)
+#       dximin      smallest step allowed     (1.0e-6, or the engine's)
+#       dximax      largest step allowed                  (0.05)
+#       dxigrow     largest growth factor per step        (1.5)
+
+import math
+import numpy as np
+import Engines
+
+class StepController:
+    '''Pick marching steps from stability and error estimates'''
+
+    SAFETY = 0.9
+    SONIC  = 1.2
+    DXIMIN = 1.0e-6
+
+    def __init__(self,values,engine=None):
+        '''CONSTRUCTOR - read the controller settings
+
+        engine is the Engine the solver runs, if it is not the one the
+        values ask for.
+        '''
+        if engine is None:
+            engine = Engines.select(values)
+        self.explicit = engine.explicit
+        self.predictor = engine.predictor
+        self.tol    = values.get('steptol',0.1 if self.predictor else 0.02)
+        self.cfl    = values.get('cfl',0.8)
+        self.dximin = values.get('dximin',max(self.DXIMIN,engine.dximin))
+        self.dximax = values.get('dximax',0.05)
+        self.grow   = values.get('dxigrow',1.5)
+        self.naccept = 0
+        self.nreject = 0
+        self.err = 0.0
+
+    def stableStep(self,solver):
+        '''Return the largest stable dxi for the current column'''
+        if not self.explicit:
+            return self.dximax
+        m = solver.metric[2]
+        s = slice(2,solver.neta)
+        rho = solver.rho[s]
+        u = solver.u[s]
+        v = solver.v[s]
+        c2 = 0.4*(solver.hinf - 0.5*(u*u + v*v))
+        # characteristic slopes exist only where the axial flow is
+        # supersonic, and blow up as it nears sonic; the layer near the
+        # wall is handled by the betloc lock, so only points clear of it
+        # (axial Mach above SONIC) set the limit
+        sup = u*u > self.SONIC**2*c2
+        if not np.any(sup):
+            return self.dximax
+        u = u[sup]
+        v = v[sup]
+        c2 = c2[sup]
+        root = np.sqrt(c2*(u*u + v*v - c2))
+        lam1 = m.etax[s][sup] + m.etar*(u*v + root)/(u*u - c2)
+        lam2 = m.etax[s][sup] + m.etar*(u*v - root)/(u*u - c2)
+        lam = max(np.max(np.abs(lam1)),np.max(np.abs(lam2)))
+        dxi = self.dximax
+        if lam > 0.0:
+            dxi = min(dxi,solver.detamin/lam)
+        # viscous diffusion in eta per unit xi
+        nu = np.max(solver.xmu2*m.etar**2/(rho[sup]*u))
+        if nu > 0.0:
+            dxi = min(dxi,0.5*solver.detamin**2/nu)
+        return self.cfl*dxi
+
+    def stepError(self,solver):
+        '''Return the rms predictor corrector pressure difference'''
+        s = slice(2,solver.neta)
+        diff = (solver.p[s] - solver.ppred[s])/solver.p[s]
+        return float(np.sqrt(np.nanmean(diff*diff)))
+
+    def accept(self,solver):
+        '''Check the step just taken and set the next dxi
+
+        Returns True if the step is kept. On a rejected step dxi is cut
+        and the caller must restore the solution and try again.
+        '''
+        err = self.stepError(solver)
+        dxi = solver.dxi
+        if math.isnan(err) or err > self.tol:
+            if dxi > self.dximin:
+                factor = 0.2
+                if not math.isnan(err):
+                    factor = max(0.2,self.SAFETY*self.tol/err)
+                self.setStep(solver,max(self.dximin,dxi*factor))
+                self.nreject += 1
+                self.err = err
+                return False
+        self.err = err
+        self.naccept += 1
+        factor = self.grow
+        if err > 0.0:
+            factor = min(factor,self.SAFETY*self.tol/err)
+        new = min(dxi*factor,self.stableStep(solver),self.dximax)
+        self.setStep(solver,max(new,self.dximin))
+        return True
+
+    def setStep(self,solver,dxi):
+        '''Change dxi, holding beta*dxi fixed'''
+        solver.beta = solver.beta*solver.dxi/dxi
+        solver.dxi = dxi
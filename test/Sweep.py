@@ -0,0 +1,315 @@
+#--------------------------------------------------------------------
+# File:     Sweep.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Parameter sweeps
+#   Runs one AXIsolver case for each of a list of value sets, spread
+#   over a pool of worker processes. A sweep is given as a list of
+#   value sets, or as base values and a grid of values to vary, whose
+#   product is the case list. Values left out come from DEFAULTS, the
+#   AXIsolver test case.
+#
+#   The geometry is named in the values:
+#       body        'ogivecylinder' (default), a Bodies catalog family
+#                   with its parameters in 'bodyparams', or a point
+#                   file for SplineBody
+#       shock       'cone' (default) or 'fit' for ShockFit
+#   Each worker builds the bodies of the whole sweep once when it
+#   starts, and the cases use them from there.
+#
+#   Results come back as the cases finish. A case that raises, runs
+#   past 'timeout' seconds or takes its worker down is recorded as
+#   failed, timeout or crashed, and the rest of the sweep goes on. Each
+#   result is added to a manifest file as one line of JSON as it
+#   arrives; a sweep started again with the same manifest runs only
+#   the cases that have no line in it, plus the failed ones if asked
+#   to retry them. With an output directory each finished case also
+#   leaves its final column there, as <key>.npz.
+#
+#   Command line:
+#       python Sweep.py spec.json [--workers N] [--timeout S]
+#           [--manifest FILE] [--outdir DIR] [--retry]
+#   where spec.json holds {"base": {...}, "grid": {...}} or
+#   {"cases": [...]}.
+
+import argparse
+import concurrent.futures as cf
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import os
+import signal
+import time
+from concurrent.futures.process import BrokenProcessPool
+from Files import savez
+
+# the AXIsolver test case
+DEFAULTS = {
+    'minf':     5.95,
+    'tref':     1464.7157,
+    'reref':    2179168.0,
+    'muref':    7.65034e-7,
+    'muinf':    0.00002,
+    'thetas':   22.0,
+    'dxi':      0.0004,
+    'neta':     31,
+    'nitmax':   750,
+    'nplot':    25,
+    'dplot':    0.05,
+}
+
+# statuses that mean the case did not run to an answer
+FAILED = ('failed','timeout','crashed')
+
+# times a case may be lost with a dying worker before it is run alone
+MAXTRIES = 2
+
+def expand(base=None,grid=None):
+    '''Return the value sets for every combination of the grid values'''
+    base = dict(base or {})
+    grid = grid or {}
+    names = sorted(grid)
+    cases = []
+    for combo in itertools.product(*[grid[name] for name in names]):
+        values = dict(base)
+        values.update(zip(names,combo))
+        cases.append(values)
+    return cases
+
+def caseKey(values):
+    '''Return a hash of a case's value set'''
+    text = json.dumps(values,sort_keys=True,default=repr)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def bodySpec(values):
+    '''Return the part of the values that picks the body'''
+    return json.dumps([values.get('body','ogivecylinder'),
+                       values.get('bodyparams',{})],sort_keys=True)
+
+#--------------------------------------------------------------------
+# worker side
+
+_bodies = {}
+
+class CaseTimeout(Exception):
+    '''A case ran past its time limit'''
+
+def _alarm(signum,frame):
+    raise CaseTimeout()
+
+def makeBody(spec):
+    '''Build a body from its spec'''
+    name, params = json.loads(spec)
+    if name == 'ogivecylinder':
+        from Body import OgiveCylinder
+        return OgiveCylinder(**params)
+    from Bodies import CATALOG, makeBody as catalogBody
+    if name in CATALOG:
+        return catalogBody(name,**params)
+    from SplineBody import SplineBody
+    return SplineBody(name,**params)
+
+def getBody(spec):
+    '''Return a body, building it the first time it is asked for'''
+    if spec not in _bodies:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _bodies[spec] = makeBody(spec)
+    return _bodies[spec]
+
+def preload(specs):
+    '''Worker start up: build the sweep's bodies'''
+    for spec in specs:
+        try:
+            getBody(spec)
+        except Exception:
+            # the cases that need it will report the error
+            pass
+
+def runCase(values,timeout=None,outdir=None):
+    '''Run one case and return its result'''
+    from AXIsolver import AXIsolver
+    from OuterBoundary import OuterCone, ShockFit
+    result = {'key': caseKey(values), 'values': values}
+    start = time.time()
+    if timeout and hasattr(signal,'setitimer'):
+        signal.signal(signal.SIGALRM,_alarm)
+        signal.setitimer(signal.ITIMER_REAL,timeout)
+    try:
+        v = dict(DEFAULTS)
+        v.update(values)
+        body = getBody(bodySpec(values))
+        solver = AXIsolver(v)
+        solver.mybody = body
+        if v.get('shock','cone') == 'fit':
+            solver.shock = ShockFit(v['thetas'],body.bodylength,v['minf'])
+        else:
+            solver.shock = OuterCone(v['thetas'],body.bodylength)
+        solver.initSolver()
+        solver.doprint = 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            steps = solver.runSolver()
+            diverged = solver.blewUp()
+        if diverged:
+            status = 'diverged'
+        elif solver.march:
+            status = 'complete'
+        else:
+            status = 'stopped'
+        result.update(status=status,steps=steps,x=float(solver.x[2]),
+                      pwall=float(solver.p[1]/solver.pinf))
+        if outdir:
+            savez(os.path.join(outdir,result['key'] + '.npz'),
+                  eta=solver.eta[1:],rho=solver.rho[1:],u=solver.u[1:],
+                  v=solver.v[1:],p=solver.p[1:])
+    except CaseTimeout:
+        result.update(status='timeout',error='ran past %g s' % timeout)
+    except Exception as e:
+        result.update(status='failed',error='%s: %s' % (type(e).__name__,e))
+    finally:
+        if timeout and hasattr(signal,'setitimer'):
+            signal.setitimer(signal.ITIMER_REAL,0)
+    result['seconds'] = time.time() - start
+    return result
+
+#--------------------------------------------------------------------
+# parent side
+
+def readManifest(manifest):
+    '''Return the last result recorded for each case key'''
+    done = {}
+    if manifest and os.path.exists(manifest):
+        with open(manifest) as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    # a line cut short when the sweep was killed
+                    continue
+                done[result['key']] = result
+    return done
+
+class Sweep:
+    '''Cases run over a pool of worker processes'''
+
+    def __init__(self,cases,workers=None,timeout=None,manifest=None,
+                 outdir=None,retry=False):
+        '''CONSTRUCTOR - cases is a list of value sets'''
+        self.cases = cases
+        self.workers = workers
+        self.timeout = timeout
+        self.manifest = manifest
+        self.outdir = outdir
+        self.retry = retry
+
+    def pending(self):
+        '''Return the cases the manifest does not show as run'''
+        done = readManifest(self.manifest)
+        todo = []
+        seen = set()
+        for values in self.cases:
+            key = caseKey(values)
+            if key in seen:
+                continue
+            seen.add(key)
+            old = done.get(key)
+            if old is None or (self.retry and old['status'] in FAILED):
+                todo.append(values)
+        return todo
+
+    def record(self,result):
+        '''Add a result to the manifest'''
+        if self.manifest:
+            with open(self.manifest,'a') as f:
+                f.write(json.dumps(result,default=repr) + '\n')
+
+    def pool(self,cases,workers):
+        '''Run cases in a new pool, yielding each with its result
+
+        The result is None for a case lost when a worker died.
+        '''
+        specs = sorted(set([bodySpec(values) for values in cases]))
+        with cf.ProcessPoolExecutor(workers,initializer=preload,
+                                    initargs=(specs,)) as pool:
+            futures = dict([(pool.submit(runCase,values,self.timeout,
+                                         self.outdir),values)
+                            for values in cases])
+            for future in cf.as_completed(futures):
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    result = None
+                yield futures[future], result
+
+    def run(self):
+        '''Run the pending cases, yielding each result as it arrives'''
+        if self.outdir:
+            os.makedirs(self.outdir,exist_ok=True)
+        queue = self.pending()
+        tries = {}
+        while queue:
+            # a dead worker takes every case still in its pool with it:
+            # those go round again together, and a case lost MAXTRIES
+            # times is then run in a pool of its own to find the culprit
+            shared = [values for values in queue
+                      if tries.get(caseKey(values),0) < MAXTRIES]
+            alone = [values for values in queue
+                     if tries.get(caseKey(values),0) >= MAXTRIES]
+            groups = [([values],1) for values in alone]
+            if shared:
+                groups.insert(0,(shared,self.workers))
+            queue = []
+            for cases, workers in groups:
+                for values, result in self.pool(cases,workers):
+                    if result is None:
+                        key = caseKey(values)
+                        tries[key] = tries.get(key,0) + 1
+                        if tries[key] <= MAXTRIES:
+                            queue.append(values)
+                            continue
+                        result = {'key': key, 'values': values,
+                                  'status': 'crashed',
+                                  'error': 'worker process died'}
+                    self.record(result)
+                    yield result
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Run a sweep of AXIsolver cases')
+    parser.add_argument('spec',help='JSON file of base and grid values, or cases')
+    parser.add_argument('--workers',type=int,default=None,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--timeout',type=float,default=None,
+                        help='seconds allowed for each case')
+    parser.add_argument('--manifest',default=None,
+                        help='results file (default: spec with .manifest.jsonl)')
+    parser.add_argument('--outdir',default=None,
+                        help='directory for the final column of each case')
+    parser.add_argument('--retry',action='store_true',
+                        help='run failed cases in the manifest again')
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    cases = spec.get('cases')
+    if cases is None:
+        cases = expand(spec.get('base'),spec.get('grid'))
+    manifest = args.manifest
+    if manifest is None:
+        manifest = os.path.splitext(args.spec)[0] + '.manifest.jsonl'
+    sweep = Sweep(cases,args.workers,args.timeout,manifest,args.outdir,
+                  args.retry)
+    todo = sweep.pending()
+    print("%d cases, %d to run" % (len(cases),len(todo)))
+    for result in sweep.run():
+        if result['status'] in FAILED:
+            print("%s %-8s %s" % (result['key'][:12],result['status'],
+                                  result.get('error','')))
+        else:
+            print("%s %-8s %5d steps x = %8.5f pwall/pinf = %8.4f  %6.1f s" % \
+                (result['key'][:12],result['status'],result['steps'],
+                 result['x'],result['pwall'],result['seconds']))
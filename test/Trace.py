@@ -0,0 +1,156 @@
+#--------------------------------------------------------------------
+# File:     Trace.py
+#
+# Author:   Roie R. Black
+# Date:     Oct 18, 2026
+#--------------------------------------------------------------------
+
+# Solver trace channel
+#   Debug output from the solver goes through a Trace object instead of
+#   print(). Each record carries a level, a tag, the station (marching
+#   step) and the grid point, so output can be filtered down to the
+#   points and stations of interest. Callers test active() once per
+#   sweep and want() per point, so a disabled trace costs one compare.
+#
+#   Records are printed as text, or written to a binary file that uses
+#   the same layout as the Fortran solver (src/trace.f):
+#       int32 tag, int32 station, int32 point, int32 n, n * float64
+#   The file is opened at the first record, so setting up a trace does
+#   not wipe out one already written.
+#
+#   The scalar and numpy engines write the same records in the same
+#   order at every level, so their trace files diff clean. The implicit
+#   engine writes only its solve records, and the Fortran kernel none.
+
+import struct
+import sys
+
+# trace levels
+OFF    = 0
+STEP   = 1      # one record per station
+POINT  = 2      # results at each grid point
+DETAIL = 3      # flux and stress terms at each grid point
+
+# record tags, shared with src/trace.f
+TAGS = {
+    1:  'wall',         # etax, den1, ueta, veta at the wall
+    2:  'wallstr',      # deldv, txx, sigxr, trr at the wall
+    3:  'wallE',        # e1, e2, e3 at the wall
+    4:  'wallF',        # f1, f2, f3 at the wall
+    5:  'pred',         # predicted ep1, ep2, ep3
+    6:  'e1x',          # e1 at the point and the next point
+    7:  'e2x',
+    8:  'e3x',
+    9:  'solve',        # aa, bb, cc handed to solve
+    10: 'phi',
+    11: 'step',         # x, dxi, delm at the end of a station
+    12: 'body',         # rb, rs at the station
+    13: 'E',            # ep1, ep2, ep3 before the predictor update
+    14: 'reject',       # x, next dxi, error of a rejected step
+}
+TAGID = dict([(name, tag) for tag, name in TAGS.items()])
+
+HEADER = struct.Struct('<iiii')
+
+class Trace:
+    '''Filtered trace output for the solvers'''
+
+    def __init__(self,level=OFF,points=None,stations=None,filename=None):
+        '''Set the trace level, point and station ranges and output file'''
+        self.level = level
+        self.points = points
+        self.stations = stations
+        self.nstation = 0
+        self.filename = None
+        if level > OFF:
+            self.filename = filename
+        self.out = None
+        self.started = False
+
+    def setStation(self,nstation):
+        '''Set the station number stamped on following records'''
+        self.nstation = nstation
+
+    def active(self,level):
+        '''Return True if records at this level are wanted this station'''
+        if self.level < level:
+            return False
+        if self.stations is not None:
+            lo, hi = self.stations
+            return lo <= self.nstation <= hi
+        return True
+
+    def want(self,i):
+        '''Return True if records for grid point i are wanted'''
+        if self.points is None:
+            return True
+        lo, hi = self.points
+        return lo <= i <= hi
+
+    def emit(self,tag,i,*values):
+        '''Write one record'''
+        if self.filename is not None:
+            if self.out is None:
+                self.open()
+            self.out.write(HEADER.pack(TAGID[tag],self.nstation,i,len(values)))
+            self.out.write(struct.pack('<%dd' % len(values),*values))
+        else:
+            print(tag,self.nstation,i,*values)
+
+    def open(self):
+        '''Open the binary trace file
+
+        The file is started over the first time, and added to if the
+        trace is closed and written to again.
+        '''
+        self.out = open(self.filename,'ab' if self.started else 'wb')
+        self.started = True
+
+    def close(self):
+        '''Close the binary trace file'''
+        if self.out is not None:
+            self.out.close()
+            self.out = None
+
+def readTrace(filename):
+    '''Generate (tag, station, point, values) records from a trace file'''
+    with open(filename,'rb') as f:
+        while True:
+            head = f.read(HEADER.size)
+            if len(head) < HEADER.size:
+                return
+            tag, station, point, n = HEADER.unpack(head)
+            values = struct.unpack('<%dd' % n,f.read(8*n))
+            yield TAGS.get(tag,str(tag)), station, point, values
+
+def diffTrace(file1,file2,tol=1.0e-10):
+    '''Return the first pair of records that differ by more than tol'''
+    recs2 = readTrace(file2)
+    for rec1 in readTrace(file1):
+        rec2 = next(recs2,None)
+        if rec2 is None or rec1[:3] != rec2[:3] or len(rec1[3]) != len(rec2[3]):
+            return rec1, rec2
+        for a, b in zip(rec1[3],rec2[3]):
+            if abs(a-b) > tol*max(1.0,abs(a),abs(b)):
+                return rec1, rec2
+    rec2 = next(recs2,None)
+    if rec2 is not None:
+        return None, rec2
+    return None
+
+if __name__ == '__main__':
+
+    # print one trace file, or report where two trace files part ways
+    if len(sys.argv) == 2:
+        for tag, station, point, values in readTrace(sys.argv[1]):
+            print(tag,station,point,*values)
+    elif len(sys.argv) == 3:
+        diff = diffTrace(sys.argv[1],sys.argv[2])
+        if diff is None:
+            print("traces match")
+        else:
+            print("traces differ:")
+            print("  <", diff[0])
+            print("  >", diff[1])
+    else:
+        print("usage: python Trace.py trace1 [trace2]")